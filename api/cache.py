@@ -0,0 +1,97 @@
+# api/cache.py
+"""
+Tenant-scoped response cache for the API.
+
+Keys are namespaced by schema and the tenant content version, so any
+Event/Registration/Company write (see the post_save/post_delete receivers in
+events/signals.py and companies/signals.py) makes every cached response of
+that tenant unreachable at once. Entries hold the payload plus its ETag and
+Last-Modified so conditional requests are answered from the cache too.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django_tenants.utils import get_tenant
+
+from eventsaas.cache import aget_tenant_version, get_tenant_version
+
+CACHE_TTL = getattr(settings, 'API_CACHE_TTL', 300)
+
+
+def _cache_key(request, version):
+    # Host is part of the key because payloads contain absolute next/previous URLs
+    url = f'{request.get_host()}{request.path}?{request.GET.urlencode()}'
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f'api:{get_tenant(request).schema_name}:{version}:{digest}'
+
+
+def _stats_key(schema_name, stat):
+    return f'api_stats:{schema_name}:{stat}'
+
+
+def _record(schema_name, stat):
+    key = _stats_key(schema_name, stat)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+async def _arecord(schema_name, stat):
+    key = _stats_key(schema_name, stat)
+    await cache.aadd(key, 0, None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        pass
+
+
+def get_cached_response(request):
+    """
+    Return the cached entry for this request, or None (counting hits and
+    misses). The version looked up is remembered on the request so that a
+    write racing with the rebuild can't get stale data stored under the
+    newer version.
+    """
+    schema_name = get_tenant(request).schema_name
+    request._api_cache_version = get_tenant_version(schema_name)
+    entry = cache.get(_cache_key(request, request._api_cache_version))
+    _record(schema_name, 'hits' if entry is not None else 'misses')
+    return entry
+
+
+async def aget_cached_response(request):
+    schema_name = get_tenant(request).schema_name
+    request._api_cache_version = await aget_tenant_version(schema_name)
+    entry = await cache.aget(_cache_key(request, request._api_cache_version))
+    await _arecord(schema_name, 'hits' if entry is not None else 'misses')
+    return entry
+
+
+def _entry(data, etag, last_modified):
+    return {'data': data, 'etag': etag, 'last_modified': last_modified}
+
+
+def cache_response(request, data, etag=None, last_modified=None):
+    """Store a payload under the version seen by get_cached_response()."""
+    entry = _entry(data, etag, last_modified)
+    cache.set(_cache_key(request, request._api_cache_version), entry, CACHE_TTL)
+    return entry
+
+
+async def acache_response(request, data, etag=None, last_modified=None):
+    entry = _entry(data, etag, last_modified)
+    await cache.aset(_cache_key(request, request._api_cache_version), entry, CACHE_TTL)
+    return entry
+
+
+def get_cache_stats(schema_name):
+    """Hit/miss counters for a tenant's API cache."""
+    stats = cache.get_many([_stats_key(schema_name, 'hits'), _stats_key(schema_name, 'misses')])
+    return {
+        'hits': stats.get(_stats_key(schema_name, 'hits'), 0),
+        'misses': stats.get(_stats_key(schema_name, 'misses'), 0),
+        'version': get_tenant_version(schema_name),
+    }
@@ -0,0 +1,51 @@
+import datetime
+
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.utils.http import http_date
+
+from api.views import respond_from_entry
+
+LAST_MODIFIED = datetime.datetime(2025, 6, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+class ConditionalResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.entry = {'data': {'results': []}, 'etag': '"abc"', 'last_modified': LAST_MODIFIED}
+
+    def get(self, **headers):
+        request = RequestFactory().get('/api/events/', headers=headers)
+        return respond_from_entry(request, self.entry, JsonResponse, hit=True)
+
+    def test_full_response_carries_validators(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"abc"')
+        self.assertEqual(response['Last-Modified'], http_date(LAST_MODIFIED.timestamp()))
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_matching_etag_is_not_modified(self):
+        self.assertEqual(self.get(if_none_match='"abc"').status_code, 304)
+
+    def test_stale_etag_gets_full_response(self):
+        self.assertEqual(self.get(if_none_match='"old"').status_code, 200)
+
+    def test_if_modified_since_alone_is_not_modified(self):
+        response = self.get(if_modified_since=http_date(LAST_MODIFIED.timestamp()))
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since_before_last_change_gets_full_response(self):
+        earlier = LAST_MODIFIED - datetime.timedelta(hours=1)
+        response = self.get(if_modified_since=http_date(earlier.timestamp()))
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_unmodified_since_before_last_change_fails_precondition(self):
+        earlier = LAST_MODIFIED - datetime.timedelta(hours=1)
+        response = self.get(if_unmodified_since=http_date(earlier.timestamp()))
+        self.assertEqual(response.status_code, 412)
+
+    def test_entry_without_validators(self):
+        self.entry.update(etag=None, last_modified=None)
+        response = self.get(if_none_match='"abc"')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
@@ -1,14 +1,20 @@
+
+from django.conf import settings
 from django.urls import path
 
-from api.views import events_api, tenant_info_api
+from api import views
 
+if getattr(settings, 'API_ASYNC_VIEWS', False):
+    tenant_info_api = views.tenant_info_api_async
+    events_api = views.events_api_async
+else:
+    tenant_info_api = views.tenant_info_api
+    events_api = views.events_api
 
 
 urlpatterns = [
    path('tenant-info/', tenant_info_api, name='tenant-info'),
    path('events/', events_api, name='events-api'),
+   path('cache-stats/', views.cache_stats_api, name='cache-stats'),
     
 ]
-
-
-
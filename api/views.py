@@ -1,8 +1,34 @@
 # Add to your eventsaas/tenant_urls.py
-from rest_framework.decorators import api_view
+import datetime
+import hashlib
+
+from django.db.models import Count, F, Max, Sum
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from django_tenants.utils import get_tenant
-from events.models import Event
+from events.models import Event, Registration
+from api.cache import (
+    acache_response, aget_cached_response, cache_response, get_cache_stats, get_cached_response,
+)
+from events.pagination import InvalidCursor, KeysetPaginator, page_size_from_request, page_url
+from events.recurrence import virtual_occurrences
+from events.search import InvalidFilter, date_range, filter_events, search_events
+
+
+def serialize_tenant(tenant):
+    return {
+        'id': tenant.id,
+        'name': tenant.name,
+        'description': tenant.description,
+        'logo': tenant.logo.url if tenant.logo else None,
+        'schema_name': tenant.schema_name,
+    }
+
 
 @api_view(['GET'])
 def tenant_info_api(request):
@@ -10,30 +36,222 @@ def tenant_info_api(request):
     if tenant.schema_name == 'public':
         return Response({'error': 'Public schema'}, status=400)
     
-    return Response({
-        'id': tenant.id,
-        'name': tenant.name,
-        'description': tenant.description,
-        'logo': tenant.logo.url if tenant.logo else None,
- 
-        'schema_name': tenant.schema_name,
-    })
+    entry = get_cached_response(request)
+    hit = entry is not None
+    if not hit:
+        entry = cache_response(request, serialize_tenant(tenant))
+    return respond_from_entry(request, entry, Response, hit)
+
+
+EVENT_FIELDS = (
+    'id', 'title', 'description', 'start_date', 'end_date',
+    'location', 'status', 'max_attendees', 'series',
+)
+
+
+def published_event_rows():
+    """
+    Published events as values() dicts with only the serialized columns.
+    Registration counts come from the denormalized Event columns, so the
+    page is a single query with no per-row COUNT.
+    """
+    return (
+        Event.objects.filter(status='published')
+        .values(*EVENT_FIELDS)
+        .annotate(registrations_count=F('confirmed_count') + F('waitlist_count'))
+    )
+
+
+def occurrence_row(event):
+    """An unsaved occurrence of a recurring event, shaped like published_event_rows()."""
+    row = {name: getattr(event, 'series_id' if name == 'series' else name) for name in EVENT_FIELDS}
+    row['registrations_count'] = 0
+    return row
+
+
+def occurrence_rows(request, lower, upper):
+    """
+    Occurrences of published series starting in (lower, upper], narrowed to
+    ?from=/?to=; the paginator merges them into its pages.
+    """
+    series = Event.objects.filter(status='published')
+    if request.GET.get('status'):
+        series = series.filter(status=request.GET['status'])
+
+    start, end = date_range(request.GET)
+    # The window is (lower, upper]; ?from= is inclusive and ?to= exclusive
+    if start is not None:
+        start -= datetime.timedelta(microseconds=1)
+        lower = start if lower is None else max(lower, start)
+    if end is not None:
+        end -= datetime.timedelta(microseconds=1)
+        upper = end if upper is None else min(upper, end)
+    return [occurrence_row(event) for event in virtual_occurrences(series, lower, upper)]
+
+
+def serialize_event(row):
+    row['start_date'] = row['start_date'].isoformat()
+    row['end_date'] = row['end_date'].isoformat()
+    return row
+
+
+def _validators(event_stats, last_registration):
+    """Build (etag, last_modified) from the aggregate state of the events API."""
+    last_modified = max(
+        (ts for ts in (event_stats['last_event'], last_registration) if ts is not None),
+        default=None,
+    )
+    fingerprint = '|'.join(str(value) for value in (
+        event_stats['last_event'], last_registration,
+        event_stats['events'], event_stats['registrations'],
+    ))
+    etag = '"%s"' % hashlib.md5(fingerprint.encode()).hexdigest()
+    return etag, last_modified
+
+
+# Counter changes (registration deletes, promotions) don't touch
+# Event.updated_at, so the counts are part of the fingerprint too.
+EVENT_STATS = {
+    'last_event': Max('updated_at'),
+    'events': Count('id'),
+    'registrations': Sum(F('confirmed_count') + F('waitlist_count')),
+}
+
+
+def events_validators():
+    """ETag / Last-Modified for the events API from two indexed aggregates."""
+    event_stats = Event.objects.aggregate(**EVENT_STATS)
+    last_registration = Registration.objects.aggregate(last=Max('updated_at'))['last']
+    return _validators(event_stats, last_registration)
+
+
+async def aevents_validators():
+    event_stats = await Event.objects.aaggregate(**EVENT_STATS)
+    last_registration = (await Registration.objects.aaggregate(last=Max('updated_at')))['last']
+    return _validators(event_stats, last_registration)
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Let the polling frontend revalidate on every request and get a 304
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def events_paginator(request, events):
+    """Keyset paginator over the given events for ?cursor= / ?page_size=."""
+    return KeysetPaginator(
+        events,
+        page_size=page_size_from_request(request),
+        cursor=request.GET.get('cursor'),
+        occurrences=lambda lower, upper: occurrence_rows(request, lower, upper),
+    )
+
+
+def paginated_payload(request, page, results):
+    return {
+        'next': page_url(request, page.next_cursor),
+        'previous': page_url(request, page.previous_cursor),
+        'results': results,
+    }
+
+
+def search_payload(rows):
+    """Search results are ranked and capped at SEARCH_LIMIT, so they have no cursors."""
+    return {'next': None, 'previous': None, 'results': [serialize_event(row) for row in rows]}
+
+
+def respond_from_entry(request, entry, response_class, hit):
+    """Build a 304 or a full response (with validators) from a cache entry."""
+    response = None
+    if entry['etag'] is not None:
+        # get_conditional_response() compares against an int timestamp
+        last_modified = entry['last_modified']
+        response = get_conditional_response(
+            request, etag=entry['etag'],
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is None:
+            response = set_validators(
+                response_class(entry['data']), entry['etag'], entry['last_modified']
+            )
+    if response is None:
+        response = response_class(entry['data'])
+    response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
 
 @api_view(['GET'])
 def events_api(request):
-    events = Event.objects.filter(status='published').order_by('start_date')
-    data = []
-    for event in events:
-        data.append({
-            'id': event.id,
-            'title': event.title,
-            'description': event.description,
-            'start_date': event.start_date.isoformat(),
-            'end_date': event.end_date.isoformat(),
-            'location': event.location,
-            'status': event.status,
-            'max_attendees': event.max_attendees,
-            'registrations_count': event.registrations.count(),
-        })
-    return Response(data)
+    entry = get_cached_response(request)
+    hit = entry is not None
+    if not hit:
+        # ?q= switches to ranked full-text search; ?status=/from=/to= filter both
+        query = request.GET.get('q', '').strip()
+        try:
+            events = filter_events(published_event_rows(), request.GET)
+            # Series templates are paged as their expanded occurrences
+            paginator = None if query else events_paginator(request, events.filter(recurrence=''))
+        except (InvalidCursor, InvalidFilter) as e:
+            return Response({'error': str(e)}, status=400)
+
+        etag, last_modified = events_validators()
+        if query:
+            payload = search_payload(search_events(events, query))
+        else:
+            page = paginator.paginate()
+            data = [serialize_event(row) for row in page.items]
+            payload = paginated_payload(request, page, data)
+        entry = cache_response(request, payload, etag, last_modified)
+
+    return respond_from_entry(request, entry, Response, hit)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats_api(request):
+    """Hit/miss counters of this tenant's API response cache."""
+    return Response(get_cache_stats(get_tenant(request).schema_name))
+
+
+# Async variants, selected in api/urls.py when settings.API_ASYNC_VIEWS is on.
+# They use the async ORM so an ASGI worker can serve many concurrent polls
+# without tying up a thread per request.
+
+@require_GET
+async def tenant_info_api_async(request):
+    tenant = get_tenant(request)
+    if tenant.schema_name == 'public':
+        return JsonResponse({'error': 'Public schema'}, status=400)
+
+    entry = await aget_cached_response(request)
+    hit = entry is not None
+    if not hit:
+        entry = await acache_response(request, serialize_tenant(tenant))
+    return respond_from_entry(request, entry, JsonResponse, hit)
+
+
+@require_GET
+async def events_api_async(request):
+    entry = await aget_cached_response(request)
+    hit = entry is not None
+    if not hit:
+        query = request.GET.get('q', '').strip()
+        try:
+            events = filter_events(published_event_rows(), request.GET)
+            paginator = None if query else events_paginator(request, events.filter(recurrence=''))
+        except (InvalidCursor, InvalidFilter) as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        etag, last_modified = await aevents_validators()
+        if query:
+            payload = search_payload([row async for row in search_events(events, query)])
+        else:
+            page = await paginator.apaginate()
+            data = [serialize_event(row) for row in page.items]
+            payload = paginated_payload(request, page, data)
+        entry = await acache_response(request, payload, etag, last_modified)
 
+    return respond_from_entry(request, entry, JsonResponse, hit)
@@ -7,6 +7,8 @@ from django.urls import reverse
 from django.utils.html import format_html
 from django_tenants.utils import get_tenant
 from .models import Company, Domain, Plan, Order
+from .stats import invalidate_platform_stats
+from .subscriptions import invalidate_subscription_state
 
 
 class SecureCompanyAdmin(admin.ModelAdmin):
@@ -23,6 +25,9 @@ class SecureCompanyAdmin(admin.ModelAdmin):
         'on_trial',
         'paid_until',
         'current_plan',
+        'tenant_events',
+        'tenant_registrations',
+        'tenant_users',
         'created_at',
         'view_users_link',
         'view_company_link'
@@ -77,13 +82,39 @@ class SecureCompanyAdmin(admin.ModelAdmin):
         tenant = get_tenant(request)
         if tenant.schema_name != 'public':
             return Company.objects.none()
-        return super().get_queryset(request)
+        return super().get_queryset(request).select_related('stats')
 
     def has_module_permission(self, request):
         """Show this admin only if in PUBLIC schema."""
         tenant = get_tenant(request)
         return tenant.schema_name == 'public'
 
+    def _tenant_stat(self, obj, name):
+        """Figure from the last `collect_tenant_stats` run, or '-' if never collected."""
+        stats = getattr(obj, 'stats', None)
+        return getattr(stats, name) if stats else "-"
+
+    def tenant_events(self, obj):
+        return self._tenant_stat(obj, 'events')
+
+    tenant_events.short_description = "Events"
+    tenant_events.admin_order_field = 'stats__events'
+
+    def tenant_registrations(self, obj):
+        return self._tenant_stat(obj, 'registrations')
+
+    tenant_registrations.short_description = "Registrations"
+    tenant_registrations.admin_order_field = 'stats__registrations'
+
+    def tenant_users(self, obj):
+        stats = getattr(obj, 'stats', None)
+        if not stats:
+            return "-"
+        return f"{stats.users} ({stats.active_users} active)"
+
+    tenant_users.short_description = "Users"
+    tenant_users.admin_order_field = 'stats__users'
+
     def view_users_link(self, obj):
         """Clickable link to view staff users for a given company (opens in new tab)."""
         if obj.schema_name:
@@ -112,6 +143,10 @@ class SecureCompanyAdmin(admin.ModelAdmin):
 
     view_company_link.short_description = "Company Page"
 
+    def invalidate_cached_subscriptions(self, queryset):
+        """queryset.update() skips post_save, so drop the cached state by hand."""
+        invalidate_subscription_state(*queryset.values_list('schema_name', flat=True))
+
     # Custom actions to bulk‐activate/deactivate or switch trial statuses:
     actions = [
         'activate_subscription',
@@ -123,6 +158,7 @@ class SecureCompanyAdmin(admin.ModelAdmin):
     def activate_subscription(self, request, queryset):
         """Mark selected companies’ subscriptions as active (no change to paid_until)."""
         updated = queryset.update(is_active_subscription=True)
+        self.invalidate_cached_subscriptions(queryset)
         self.message_user(request, f"{updated} company(ies) marked active.")
 
     activate_subscription.short_description = "✓ Activate subscription for selected companies"
@@ -130,6 +166,7 @@ class SecureCompanyAdmin(admin.ModelAdmin):
     def deactivate_subscription(self, request, queryset):
         """Mark selected companies’ subscriptions as inactive (no change to paid_until)."""
         updated = queryset.update(is_active_subscription=False)
+        self.invalidate_cached_subscriptions(queryset)
         self.message_user(request, f"{updated} company(ies) deactivated.")
 
     deactivate_subscription.short_description = "✗ Deactivate subscription for selected companies"
@@ -137,6 +174,7 @@ class SecureCompanyAdmin(admin.ModelAdmin):
     def mark_as_trial(self, request, queryset):
         """Put selected companies back on trial (no change to paid_until)."""
         updated = queryset.update(on_trial=True)
+        invalidate_platform_stats()
         self.message_user(request, f"{updated} company(ies) set to trial.")
 
     mark_as_trial.short_description = "Mark selected companies as trial"
@@ -144,6 +182,7 @@ class SecureCompanyAdmin(admin.ModelAdmin):
     def mark_as_active(self, request, queryset):
         """Remove trial status for selected companies (no change to paid_until)."""
         updated = queryset.update(on_trial=False)
+        invalidate_platform_stats()
         self.message_user(request, f"{updated} company(ies) removed from trial.")
 
     mark_as_active.short_description = "Remove trial status for selected companies"
@@ -0,0 +1,83 @@
+# companies/management/commands/collect_tenant_stats.py
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from companies.models import Company, TenantStats
+from companies.parallel import map_schemas
+from companies.stats import invalidate_platform_stats
+from events.models import Event
+
+ACTIVE_USER_DAYS = 30
+
+
+def collect(schema_name):
+    """Usage figures for the current tenant schema: two aggregate queries."""
+    now = timezone.now()
+    figures = Event.objects.aggregate(
+        events=Count('id'),
+        upcoming_events=Count('id', filter=Q(status='published', start_date__gt=now)),
+        # Denormalized counters, so registrations are never scanned
+        registrations=Coalesce(Sum(F('confirmed_count') + F('waitlist_count')), 0),
+    )
+    figures.update(get_user_model().objects.aggregate(
+        users=Count('id'),
+        active_users=Count('id', filter=Q(
+            is_active=True,
+            last_login__gte=now - datetime.timedelta(days=ACTIVE_USER_DAYS),
+        )),
+    ))
+    return figures
+
+
+class Command(BaseCommand):
+    help = (
+        'Collect per-tenant usage (events, registrations, users) from every tenant '
+        'schema in parallel into the public TenantStats table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, help='Only collect this tenant schema')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Schemas collected concurrently; each holds one DB connection (default: 4)')
+
+    def handle(self, *args, **options):
+        companies = Company.objects.exclude(schema_name='public').order_by('schema_name')
+        if options['schema']:
+            companies = companies.filter(schema_name=options['schema'])
+            if not companies.exists():
+                raise CommandError(f'No tenant with schema "{options["schema"]}"')
+        company_ids = dict(companies.values_list('schema_name', 'id'))
+
+        rows, failures = [], []
+        for result in map_schemas(collect, list(company_ids), options['workers']):
+            if not result.ok:
+                failures.append(result.schema_name)
+                self.stdout.write(self.style.ERROR(f'{result.schema_name}: {result.error}'))
+                continue
+            rows.append(TenantStats(
+                company_id=company_ids[result.schema_name],
+                collected_at=timezone.now(),
+                collect_duration=result.duration,
+                **result.result,
+            ))
+            self.stdout.write(f'{result.schema_name}: {result.duration:.2f}s')
+
+        # One upsert for all tenants
+        TenantStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['company'],
+            update_fields=[
+                'events', 'upcoming_events', 'registrations', 'users', 'active_users',
+                'collected_at', 'collect_duration',
+            ],
+        )
+        invalidate_platform_stats()
+
+        if failures:
+            raise CommandError(f'Could not collect {len(failures)} schema(s): {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS(f'✓ Collected stats for {len(rows)} tenant(s)'))
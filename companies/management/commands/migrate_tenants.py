@@ -0,0 +1,136 @@
+# companies/management/commands/migrate_tenants.py
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django_tenants.utils import schema_exists
+from companies.models import Company
+from companies.provisioning import TEMPLATE_SCHEMA
+
+DEFAULT_CHECKPOINT = '.migrate_tenants.checkpoint'
+
+
+def migrate_schema(schema_name):
+    """Runs in a worker process. Returns (schema_name, error or None, seconds)."""
+    started = time.monotonic()
+    try:
+        call_command('migrate_schemas', tenant=True, schema_name=schema_name,
+                     interactive=False, verbosity=0)
+        error = None
+    except Exception as e:
+        # Exceptions don't always pickle; the message is enough for the report
+        error = f'{type(e).__name__}: {e}'
+    finally:
+        connections.close_all()
+    return schema_name, error, time.monotonic() - started
+
+
+def migrations_fingerprint():
+    """Identifies the target migration state, so a checkpoint from another deploy is ignored."""
+    leaves = sorted(MigrationLoader(None, ignore_no_migrations=True).graph.leaf_nodes())
+    return hashlib.sha1(repr(leaves).encode()).hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        'Migrate every tenant schema (and the template schema) in parallel worker '
+        'processes. Completed schemas are checkpointed, so re-running after a '
+        'failure or interruption only migrates what is left.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Schemas migrated concurrently (default: 4)')
+        parser.add_argument('--checkpoint', type=str, default=DEFAULT_CHECKPOINT,
+                            help=f'Checkpoint file of completed schemas (default: {DEFAULT_CHECKPOINT})')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore an existing checkpoint and migrate every schema')
+        parser.add_argument('--skip-shared', action='store_true',
+                            help='Do not migrate the public schema first')
+        parser.add_argument('--slowest', type=int, default=10,
+                            help='Number of slowest schemas to list in the summary (default: 10)')
+
+    def handle(self, *args, **options):
+        if not options['skip_shared']:
+            self.stdout.write('Migrating public schema...')
+            started = time.monotonic()
+            call_command('migrate_schemas', shared=True, interactive=False, verbosity=0)
+            self.stdout.write(f'public: {time.monotonic() - started:.2f}s')
+
+        schema_names = list(
+            Company.objects.exclude(schema_name='public')
+            .order_by('schema_name').values_list('schema_name', flat=True)
+        )
+        if TEMPLATE_SCHEMA and schema_exists(TEMPLATE_SCHEMA):
+            # New tenants are cloned from it, so it must not fall behind
+            schema_names.insert(0, TEMPLATE_SCHEMA)
+
+        fingerprint = migrations_fingerprint()
+        done = set() if options['restart'] else self.read_checkpoint(options['checkpoint'], fingerprint)
+        pending = [name for name in schema_names if name not in done]
+        if done:
+            self.stdout.write(f'Resuming: {len(schema_names) - len(pending)} schema(s) already migrated')
+        self.stdout.write(f'Migrating {len(pending)} schema(s) with {options["workers"]} worker(s)...')
+
+        durations, failures = [], []
+        started = time.monotonic()
+        # Workers are forked, so they must not inherit open connections
+        connections.close_all()
+        with open(options['checkpoint'], 'a' if done else 'w') as checkpoint:
+            if not done:
+                checkpoint.write(f'# {fingerprint}\n')
+            pool = ProcessPoolExecutor(max_workers=max(1, options['workers']),
+                                       mp_context=multiprocessing.get_context('fork'))
+            with pool:
+                futures = [pool.submit(migrate_schema, name) for name in pending]
+                for future in as_completed(futures):
+                    schema_name, error, seconds = future.result()
+                    durations.append((seconds, schema_name))
+                    if error:
+                        failures.append(schema_name)
+                        self.stdout.write(self.style.ERROR(f'{schema_name}: failed after {seconds:.2f}s: {error}'))
+                        continue
+                    checkpoint.write(f'{schema_name}\n')
+                    checkpoint.flush()
+                    self.stdout.write(f'{schema_name}: {seconds:.2f}s')
+
+        self.report(durations, time.monotonic() - started, options['slowest'])
+        if failures:
+            raise CommandError(
+                f'{len(failures)} schema(s) failed: {", ".join(sorted(failures))}. '
+                'Fix the cause and re-run to migrate only the remaining schemas.'
+            )
+
+        os.remove(options['checkpoint'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {len(pending)} schema(s)'))
+
+    def read_checkpoint(self, path, fingerprint):
+        """Schemas completed by an interrupted run towards the same migrations."""
+        try:
+            with open(path) as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return set()
+        if not lines or lines[0] != f'# {fingerprint}':
+            self.stdout.write(self.style.WARNING('Checkpoint is for different migrations, starting over'))
+            return set()
+        return set(lines[1:])
+
+    def report(self, durations, elapsed, slowest):
+        if not durations:
+            return
+        total = sum(seconds for seconds, _ in durations)
+        self.stdout.write(
+            f'\n{len(durations)} schema(s) in {elapsed:.2f}s wall clock, '
+            f'{total:.2f}s of migration time (avg {total / len(durations):.2f}s)'
+        )
+        if slowest > 0:
+            self.stdout.write(f'Slowest {min(slowest, len(durations))}:')
+            for seconds, schema_name in sorted(durations, reverse=True)[:slowest]:
+                self.stdout.write(f'  {schema_name:<40} {seconds:7.2f}s')
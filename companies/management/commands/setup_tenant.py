@@ -4,6 +4,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django_tenants.utils import schema_context
 from companies.models import Company, Domain
+from companies.provisioning import TEMPLATE_SCHEMA, StepTimer, schema_name_for
 
 class Command(BaseCommand):
     help = 'Complete tenant setup: company, domain, schema, and admin user'
@@ -23,10 +24,14 @@ class Command(BaseCommand):
         admin_password = options['admin_password']
         
         # Create schema name from company name
-        schema_name = company_name.lower().replace(' ', '').replace('-', '').replace('.', '')[:63]
+        schema_name = schema_name_for(company_name)
         
+        timer = StepTimer()
         try:
             # Check if company already exists
+            if schema_name == TEMPLATE_SCHEMA:
+                raise CommandError(f'"{schema_name}" is reserved for the tenant template schema')
+
             if Company.objects.filter(schema_name=schema_name).exists():
                 raise CommandError(f'Company with schema "{schema_name}" already exists')
             
@@ -37,37 +42,29 @@ class Command(BaseCommand):
             self.stdout.write(f'Schema: {schema_name}')
             self.stdout.write(f'Domain: {domain}')
             
-            # Create the company (tenant)
-            company = Company.objects.create(
-                name=company_name,
-                schema_name=schema_name,
-                paid_until='2099-12-31',
-                on_trial=False,
-            )
+            # Create the company (tenant); Company.create_schema() brings the
+            # template up to date and clones the schema from it
+            with timer.step('company + schema'):
+                company = Company.objects.create(
+                    name=company_name,
+                    schema_name=schema_name,
+                    paid_until='2099-12-31',
+                    on_trial=False,
+                )
             
             # Create the domain
-            domain_obj = Domain.objects.create(
-                domain=domain,
-                tenant=company,
-                is_primary=True
-            )
-            
-            self.stdout.write(self.style.SUCCESS(f'✓ Company and domain created'))
-            
-            # Migrate the new tenant schema
-            self.stdout.write('Migrating tenant schema...')
-            from django.core.management import call_command
-            try:
-                call_command('migrate_schemas', verbosity=0)
-            except Exception as e:
-                self.stdout.write(
-                    self.style.WARNING(f'Migration warning: {e}')
+            with timer.step('domain'):
+                domain_obj = Domain.objects.create(
+                    domain=domain,
+                    tenant=company,
+                    is_primary=True
                 )
-                self.stdout.write('You may need to run: python manage.py migrate_schemas')
+            
+            self.stdout.write(self.style.SUCCESS(f'✓ Company, schema and domain created'))
             
             # Create admin user in the tenant schema
             User = get_user_model()
-            with schema_context(schema_name):
+            with timer.step('admin user'), schema_context(schema_name):
                 if User.objects.filter(username=admin_username).exists():
                     self.stdout.write(
                         self.style.WARNING(f'Admin user "{admin_username}" already exists in tenant')
@@ -90,6 +87,8 @@ class Command(BaseCommand):
             self.stdout.write(f'Admin: http://{domain}:8000/admin/')
             self.stdout.write(f'Login: {admin_username} / {admin_password}')
             self.stdout.write(self.style.SUCCESS('='*50))
+            self.stdout.write('Timings:')
+            self.stdout.write(timer.report())
             
         except Exception as e:
             raise CommandError(f'Error creating tenant: {str(e)}')
\ No newline at end of file
@@ -0,0 +1,289 @@
+# companies/management/commands/setup_tenants_bulk.py
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from django_tenants.postgresql_backend.base import is_valid_schema_name
+from django_tenants.utils import schema_context, schema_exists
+from companies.models import Company, Domain, Plan
+from companies.provisioning import (
+    TEMPLATE_SCHEMA, StepTimer, clone_tenant_schema, ensure_template_schema, install_clone_function,
+    schema_name_for,
+)
+from companies.stats import invalidate_platform_stats
+from companies.subscriptions import invalidate_subscription_state
+from companies.tenant_cache import invalidate_tenant_cache
+
+FIELDS = ('name', 'domain', 'admin_username', 'admin_email', 'admin_password', 'plan')
+
+
+def provision_tenant(schema_name, admin):
+    """
+    Runs in a worker process: create the tenant schema (cloned from the
+    template) and its admin user. Returns (schema_name, error or None,
+    seconds, whether this call created the schema).
+    """
+    started = time.monotonic()
+    created_schema = False
+    try:
+        company = Company.objects.get(schema_name=schema_name)
+        # Validated as free, but something else may have created it since
+        if schema_exists(schema_name):
+            raise CommandError(f'Schema "{schema_name}" already exists')
+        created_schema = True
+        clone_tenant_schema(company)
+
+        User = get_user_model()
+        with schema_context(schema_name):
+            # One INSERT and one password hash; the hashing is what costs
+            User.objects.create(
+                username=admin['username'],
+                email=User.objects.normalize_email(admin['email']),
+                password=make_password(admin['password']),
+                is_staff=True,
+                is_superuser=True,
+            )
+        error = None
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    finally:
+        connections.close_all()
+    return schema_name, error, time.monotonic() - started, created_schema
+
+
+class Command(BaseCommand):
+    help = (
+        'Set up many tenants from a CSV or JSON manifest (columns: name, domain, '
+        'admin_username, admin_email, admin_password, plan). All rows are validated '
+        'before anything is created; schemas are provisioned in parallel.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('manifest', type=str, help='Path to a .csv or .json manifest')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Tenants provisioned concurrently (default: 4)')
+        parser.add_argument('--skip-existing', action='store_true',
+                            help='Skip rows whose company already exists instead of failing')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only validate the manifest')
+
+    def handle(self, *args, **options):
+        timer = StepTimer()
+
+        with timer.step('validate manifest'):
+            rows = self.read_manifest(options['manifest'])
+            tenants = self.validate(rows, options['skip_existing'])
+
+        if not tenants:
+            self.stdout.write(self.style.WARNING('Nothing to set up'))
+            return
+        self.stdout.write(f'{len(tenants)} tenant(s) validated')
+        if options['dry_run']:
+            return
+
+        with timer.step('template schema'):
+            ensure_template_schema()
+            # Once, before forking: workers only call the function
+            install_clone_function()
+
+        with timer.step('companies + domains'):
+            self.create_rows(tenants)
+
+        with timer.step('schemas + admins'):
+            failures = self.provision(tenants, options['workers'])
+
+        if failures:
+            # Remove the half-created tenants so the manifest can simply be
+            # re-run, dropping only the schemas this run created
+            with timer.step('clean up failures'):
+                for company in Company.objects.filter(schema_name__in=failures):
+                    company.auto_drop_schema = failures[company.schema_name]
+                    company.delete()
+
+        self.stdout.write('Timings:')
+        self.stdout.write(timer.report())
+
+        created = [tenant for tenant in tenants if tenant['schema_name'] not in failures]
+        if created:
+            self.stdout.write(self.style.SUCCESS('\n' + '=' * 50))
+            for tenant in created:
+                self.stdout.write(
+                    f'{tenant["name"]}: http://{tenant["domain"]}:8000/admin/  '
+                    f'{tenant["admin"]["username"]} / {tenant["admin"]["password"]}'
+                )
+            self.stdout.write(self.style.SUCCESS('=' * 50))
+
+        if failures:
+            raise CommandError(
+                f'{len(failures)} tenant(s) failed and were removed: {", ".join(sorted(failures))}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'✓ Set up {len(created)} tenant(s)'))
+
+    def read_manifest(self, path):
+        """List of row dicts from a .json (array of objects) or .csv (with header) manifest."""
+        try:
+            with open(path, newline='', encoding='utf-8') as f:
+                if os.path.splitext(path)[1].lower() == '.json':
+                    rows = json.load(f)
+                    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                        raise CommandError('A JSON manifest must be an array of objects')
+                else:
+                    rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(f'Cannot read manifest: {e}')
+        except (ValueError, csv.Error) as e:
+            raise CommandError(f'Invalid manifest: {e}')
+        return [{field: str(row.get(field) or '').strip() for field in FIELDS} for row in rows]
+
+    def validate(self, rows, skip_existing):
+        """
+        Check every row, against each other and against the database, before
+        anything is created. Raises CommandError listing all problems.
+        """
+        errors, tenants = [], []
+        for number, row in enumerate(rows, start=1):
+            if not row['name'] or not row['domain']:
+                errors.append(f'row {number}: name and domain are required')
+                continue
+            schema_name = schema_name_for(row['name'])
+            if not is_valid_schema_name(schema_name) or schema_name in ('public', TEMPLATE_SCHEMA):
+                errors.append(f'row {number}: "{row["name"]}" gives unusable schema name "{schema_name}"')
+                continue
+            domain = row['domain'].lower()
+            tenants.append({
+                'row': number,
+                'name': row['name'],
+                'schema_name': schema_name,
+                'domain': domain,
+                'plan': row['plan'],
+                'admin': {
+                    'username': row['admin_username'] or 'admin',
+                    'email': row['admin_email'] or f'admin@{domain}',
+                    'password': row['admin_password'] or get_random_string(16),
+                },
+            })
+
+        # Duplicates inside the manifest
+        for key in ('name', 'schema_name', 'domain'):
+            seen = {}
+            for tenant in tenants:
+                if tenant[key] in seen:
+                    errors.append(
+                        f'row {tenant["row"]}: duplicate {key} "{tenant[key]}" (also row {seen[tenant[key]]})'
+                    )
+                seen.setdefault(tenant[key], tenant['row'])
+
+        # Conflicts with existing tenants: one query per kind
+        existing = set(Company.objects.filter(
+            schema_name__in=[tenant['schema_name'] for tenant in tenants]
+        ).values_list('schema_name', flat=True))
+        existing_names = set(Company.objects.filter(
+            name__in=[tenant['name'] for tenant in tenants]
+        ).values_list('name', flat=True))
+        # Schemas without a Company, e.g. left over by a crashed run
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT nspname FROM pg_namespace WHERE nspname = ANY(%s)',
+                           [[tenant['schema_name'] for tenant in tenants]])
+            existing_schemas = {name for name, in cursor.fetchall()}
+        taken_domains = set(Domain.objects.filter(
+            domain__in=[tenant['domain'] for tenant in tenants]
+        ).values_list('domain', flat=True))
+        plans = {plan.name: plan for plan in Plan.objects.filter(
+            name__in={tenant['plan'] for tenant in tenants if tenant['plan']}, is_active=True,
+        )}
+
+        valid = []
+        for tenant in tenants:
+            if tenant['schema_name'] in existing or tenant['name'] in existing_names:
+                if skip_existing:
+                    self.stdout.write(f'row {tenant["row"]}: {tenant["name"]} already exists, skipped')
+                    continue
+                errors.append(f'row {tenant["row"]}: company "{tenant["name"]}" already exists')
+            elif tenant['schema_name'] in existing_schemas:
+                # Never clone over (or drop) a schema this command did not create
+                errors.append(f'row {tenant["row"]}: schema "{tenant["schema_name"]}" already exists')
+            if tenant['domain'] in taken_domains:
+                errors.append(f'row {tenant["row"]}: domain "{tenant["domain"]}" already exists')
+            if tenant['plan'] and tenant['plan'] not in plans:
+                errors.append(f'row {tenant["row"]}: no active plan named "{tenant["plan"]}"')
+            tenant['plan'] = plans.get(tenant['plan'])
+            valid.append(tenant)
+
+        if errors:
+            for error in errors:
+                self.stdout.write(self.style.ERROR(error))
+            raise CommandError(f'Manifest has {len(errors)} problem(s); nothing was created')
+        return valid
+
+    def create_rows(self, tenants):
+        """
+        Insert all Company and Domain rows with two bulk inserts. bulk_create
+        skips save() and its signals, so no schema is created here and the
+        caches the signals would have cleared are cleared below.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            companies = Company.objects.bulk_create([
+                Company(
+                    name=tenant['name'],
+                    schema_name=tenant['schema_name'],
+                    paid_until='2099-12-31',
+                    on_trial=False,
+                    current_plan=tenant['plan'],
+                    subscription_start=now if tenant['plan'] else None,
+                )
+                for tenant in tenants
+            ])
+            Domain.objects.bulk_create([
+                Domain(domain=tenant['domain'], tenant=company, is_primary=True)
+                for tenant, company in zip(tenants, companies)
+            ])
+
+        invalidate_subscription_state(*(tenant['schema_name'] for tenant in tenants))
+        invalidate_tenant_cache()
+        invalidate_platform_stats()
+
+    def provision(self, tenants, workers):
+        """
+        Create schemas and admin users on a process pool. Returns the failed
+        schema names, mapped to whether this run created their schema.
+        """
+        failures, done = {}, set()
+        # Workers are forked, so they must not inherit open connections
+        connections.close_all()
+        pool = ProcessPoolExecutor(max_workers=max(1, workers),
+                                   mp_context=multiprocessing.get_context('fork'))
+        try:
+            with pool:
+                futures = [
+                    pool.submit(provision_tenant, tenant['schema_name'], tenant['admin'])
+                    for tenant in tenants
+                ]
+                for future in as_completed(futures):
+                    schema_name, error, seconds, created_schema = future.result()
+                    done.add(schema_name)
+                    if error:
+                        failures[schema_name] = created_schema
+                        self.stdout.write(self.style.ERROR(f'{schema_name}: failed after {seconds:.2f}s: {error}'))
+                    else:
+                        self.stdout.write(f'{schema_name}: {seconds:.2f}s')
+        except BrokenProcessPool:
+            # A worker died: every unfinished tenant failed. Their schemas were
+            # checked to be free during validation, so any that exists now is ours.
+            unfinished = [tenant['schema_name'] for tenant in tenants if tenant['schema_name'] not in done]
+            self.stdout.write(self.style.ERROR(
+                f'A worker process died; {len(unfinished)} tenant(s) were not finished'
+            ))
+            for schema_name in unfinished:
+                failures[schema_name] = True
+        return failures
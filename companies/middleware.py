@@ -1,11 +1,39 @@
 # companies/middleware.py
 
+import copy
 import re
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.shortcuts import render, redirect
-from django_tenants.utils import get_tenant, schema_context
-from .models import Company
-from django.utils import timezone
+from django_tenants.middleware.main import TenantMainMiddleware
+from django_tenants.utils import get_tenant
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from .subscriptions import is_subscription_active
+from .tenant_cache import NOT_FOUND, cache_tenant, get_cached_tenant
+from .utils import aget_request_subscription, get_request_company, get_request_subscription
+
+
+class CachedTenantMainMiddleware(TenantMainMiddleware):
+    """
+    Drop-in replacement for django_tenants' TenantMainMiddleware that caches
+    hostname → tenant resolution, including hosts with no tenant, so the
+    Domain/Company join only runs on a cache miss.
+    """
+
+    def get_tenant(self, domain_model, hostname):
+        tenant = get_cached_tenant(hostname)
+        if tenant is None:
+            try:
+                tenant = super().get_tenant(domain_model, hostname)
+            except domain_model.DoesNotExist:
+                tenant = NOT_FOUND
+            cache_tenant(hostname, tenant)
+
+        if tenant == NOT_FOUND:
+            raise domain_model.DoesNotExist(f'No tenant for hostname "{hostname}"')
+
+        # process_request() sets attributes on the tenant, so hand out a copy
+        return copy.copy(tenant)
 
 
 class SubscriptionMiddleware:
@@ -13,10 +41,18 @@ class SubscriptionMiddleware:
     Simplified middleware that only:
     1) Blocks /admin/ for all tenants
     2) Redirects inactive subscriptions to subscription_check view
+
+    Runs natively under both WSGI and ASGI.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
         # URIs that are NEVER allowed for any tenant
         self.tenant_blocked_patterns = [
@@ -49,37 +85,53 @@ class SubscriptionMiddleware:
         """Return True if path should bypass subscription check."""
         return any(rx.match(path) for rx in self.bypass_regex)
 
-    def __call__(self, request):
+    def needs_subscription_check(self, request) -> bool:
+        """Attach request.company and return True if the subscription must be checked."""
         tenant = get_tenant(request)
-        path = request.path
+
+        # Loaded on first access and shared by views and templates
+        request.company = SimpleLazyObject(lambda: get_request_company(request))
 
         # Only process tenant requests (not public schema)
-        if tenant.schema_name != 'public':
-            
-            # # 1) Block /admin/ for ALL tenants
-            # if self.is_tenant_path_blocked(path):
-            #     return render(request, 'subscriptions/admin_blocked.html', {
-            #         'tenant': tenant,
-            #     }, status=403)
-
-            # 2) Check subscription status (unless bypassing)
-            if not self.should_bypass_check(path):
-                try:
-                    with schema_context('public'):
-                        company = Company.objects.get(schema_name=tenant.schema_name)
-                except Company.DoesNotExist:
-                    return render(request, 'subscriptions/company_not_found.html', status=404)
-
-                # Check if subscription is active
-                now_date = timezone.now().date()
-                expired = (
-                    not company.is_active_subscription or
-                    (company.paid_until and company.paid_until < now_date)
-                )
+        if tenant.schema_name == 'public':
+            return False
+
+        # # 1) Block /admin/ for ALL tenants
+        # if self.is_tenant_path_blocked(request.path):
+        #     return render(request, 'subscriptions/admin_blocked.html', {
+        #         'tenant': tenant,
+        #     }, status=403)
+
+        # 2) Check subscription status (unless bypassing)
+        return not self.should_bypass_check(request.path)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
 
-                if expired:
-                    # Redirect to subscription check view with next parameter
-                    return redirect(f'/subscription-check/?next={path}')
+        if self.needs_subscription_check(request):
+            # Cached per schema, so this normally costs no queries
+            state = get_request_subscription(request)
+            if not state['exists']:
+                return render(request, 'subscriptions/company_not_found.html', status=404)
+
+            if not is_subscription_active(state):
+                # Redirect to subscription check view with next parameter
+                return redirect(f'/subscription-check/?next={request.path}')
 
         # Normal flow
-        return self.get_response(request)
\ No newline at end of file
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self.needs_subscription_check(request):
+            # Only a cache miss leaves the event loop
+            state = await aget_request_subscription(request)
+            if not state['exists']:
+                return await sync_to_async(render)(
+                    request, 'subscriptions/company_not_found.html', status=404
+                )
+
+            if not is_subscription_active(state):
+                return redirect(f'/subscription-check/?next={request.path}')
+
+        return await self.get_response(request)
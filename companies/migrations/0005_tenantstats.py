@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_plan_company_subscription_start_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantStats',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='companies.company')),
+                ('events', models.PositiveIntegerField(default=0)),
+                ('upcoming_events', models.PositiveIntegerField(default=0, help_text='Published events that have not started yet.')),
+                ('registrations', models.PositiveIntegerField(default=0, help_text='Confirmed and waitlisted registrations.')),
+                ('users', models.PositiveIntegerField(default=0)),
+                ('active_users', models.PositiveIntegerField(default=0, help_text='Users who logged in during the last 30 days.')),
+                ('collected_at', models.DateTimeField()),
+                ('collect_duration', models.FloatField(default=0, help_text='Seconds it took to collect these figures.')),
+            ],
+            options={
+                'verbose_name_plural': 'Tenant stats',
+            },
+        ),
+    ]
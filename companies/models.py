@@ -2,8 +2,11 @@
 
 from django.db import models
 from django_tenants.models import TenantMixin, DomainMixin
+from django_tenants.utils import schema_exists
 from django.utils import timezone
 
+from .provisioning import ensure_template_schema
+
 
 class TimeStampedModel(models.Model):
     """Abstract base model that provides self-updating created_at and updated_at fields."""
@@ -102,6 +105,16 @@ class Company(TenantMixin, TimeStampedModel):
     def __str__(self):
         return self.name
 
+    def create_schema(self, check_if_exists=False, sync_schema=True, verbosity=1):
+        """
+        The schema is cloned from the template with its migrations faked, so
+        migrate the template first: every creation path (setup commands, the
+        admin add form, Company.objects.create) must get the current tables.
+        """
+        if sync_schema and not (check_if_exists and schema_exists(self.schema_name)):
+            ensure_template_schema()
+        return super().create_schema(check_if_exists, sync_schema, verbosity)
+
     class Meta:
         verbose_name_plural = "Companies"
         ordering = ['name']
@@ -167,3 +180,42 @@ class Order(models.Model):
 
     def __str__(self):
         return f"Order #{self.id} — {self.company.name} — {self.plan.name} ({self.status})"
+
+
+class TenantStats(models.Model):
+    """
+    Per-tenant usage figures, stored in the public schema so the admin and the
+    homepage can read them without entering every tenant schema. Refreshed by
+    `manage.py collect_tenant_stats`.
+    """
+    company = models.OneToOneField(
+        Company,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    events = models.PositiveIntegerField(default=0)
+    upcoming_events = models.PositiveIntegerField(
+        default=0,
+        help_text="Published events that have not started yet."
+    )
+    registrations = models.PositiveIntegerField(
+        default=0,
+        help_text="Confirmed and waitlisted registrations."
+    )
+    users = models.PositiveIntegerField(default=0)
+    active_users = models.PositiveIntegerField(
+        default=0,
+        help_text="Users who logged in during the last 30 days."
+    )
+    collected_at = models.DateTimeField()
+    collect_duration = models.FloatField(
+        default=0,
+        help_text="Seconds it took to collect these figures."
+    )
+
+    class Meta:
+        verbose_name_plural = "Tenant stats"
+
+    def __str__(self):
+        return f"Stats for {self.company_id}"
@@ -0,0 +1,51 @@
+# companies/parallel.py
+"""
+Run per-tenant work concurrently.
+
+Each task runs on a pool thread inside schema_context(schema_name). Django
+connections are per thread, so the pool size is also the number of database
+connections used; each task closes its connection when done so nothing is
+left open once the pool shuts down.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from django.db import connection
+from django_tenants.utils import schema_context
+
+
+@dataclass
+class SchemaResult:
+    schema_name: str
+    result: object = None
+    error: Exception = None
+    duration: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _run(func, schema_name):
+    started = time.monotonic()
+    try:
+        with schema_context(schema_name):
+            return SchemaResult(schema_name, result=func(schema_name),
+                                duration=time.monotonic() - started)
+    except Exception as e:
+        return SchemaResult(schema_name, error=e, duration=time.monotonic() - started)
+    finally:
+        connection.close()
+
+
+def map_schemas(func, schema_names, workers=4):
+    """
+    Call func(schema_name) in each schema on at most `workers` threads.
+    Yields a SchemaResult per schema as it finishes; an exception in one
+    schema is captured in its result and does not stop the others.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(_run, func, schema_name) for schema_name in schema_names]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,99 @@
+# companies/provisioning.py
+"""
+Tenant schema provisioning.
+
+Creating a Company clones TENANT_BASE_SCHEMA (see settings) and only fakes
+the new schema's migrations, so onboarding a tenant costs the same however
+many tenants exist. That is only correct while the template is fully
+migrated, so Company.create_schema() runs ensure_template_schema() first (as
+does setup_tenants_bulk before forking); it is a no-op apart from the
+migration check when nothing is pending.
+"""
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django_tenants.clone import CloneSchema
+from django_tenants.utils import get_tenant_database_alias, schema_exists
+
+TEMPLATE_SCHEMA = getattr(settings, 'TENANT_BASE_SCHEMA', None)
+
+
+def schema_name_for(company_name):
+    """Schema name derived from a company name, as setup_tenant has always done."""
+    return company_name.lower().replace(' ', '').replace('-', '').replace('.', '')[:63]
+
+
+def ensure_template_schema(verbosity=0):
+    """Create the template schema if needed and apply pending tenant migrations to it."""
+    if not TEMPLATE_SCHEMA:
+        return
+    connection = connections[get_tenant_database_alias()]
+    if not schema_exists(TEMPLATE_SCHEMA):
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA "{TEMPLATE_SCHEMA}"')
+    call_command('migrate_schemas', tenant=True, schema_name=TEMPLATE_SCHEMA,
+                 interactive=False, verbosity=verbosity)
+    connection.set_schema_to_public()
+
+
+def install_clone_function():
+    """
+    (Re)create django-tenants' clone_schema() SQL function. Company.create_schema()
+    does this on every call, which races when several processes provision at
+    once, so parallel provisioning installs it once up front and then uses
+    clone_tenant_schema().
+    """
+    CloneSchema()._create_clone_schema_function()
+
+
+def clone_tenant_schema(company, verbosity=0):
+    """
+    Create company's schema as a copy of the template and fake its migrations,
+    like Company.create_schema() but without touching the clone function.
+    Falls back to create_schema() when there is no template.
+    """
+    if not TEMPLATE_SCHEMA or not schema_exists(TEMPLATE_SCHEMA):
+        company.create_schema(check_if_exists=True, verbosity=verbosity)
+        return
+    if schema_exists(company.schema_name, case_sensitive=False):
+        raise ValidationError(f'Schema "{company.schema_name}" already exists')
+
+    connection = connections[get_tenant_database_alias()]
+    connection.set_schema_to_public()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT clone_schema(%s, %s, %s)',
+            [TEMPLATE_SCHEMA, company.schema_name, company.clone_mode],
+        )
+    call_command('migrate_schemas', tenant=True, fake=True, schema_name=company.schema_name,
+                 interactive=False, verbosity=verbosity)
+    connection.set_schema_to_public()
+
+
+class StepTimer:
+    """Wall-clock time of named provisioning steps, in the order they ran."""
+
+    def __init__(self):
+        self.steps = []
+
+    @contextmanager
+    def step(self, name):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.monotonic() - started))
+
+    @property
+    def total(self):
+        return sum(seconds for _, seconds in self.steps)
+
+    def report(self):
+        width = max((len(name) for name, _ in self.steps), default=0)
+        lines = [f'  {name:<{width}}  {seconds:7.2f}s' for name, seconds in self.steps]
+        lines.append(f'  {"total":<{width}}  {self.total:7.2f}s')
+        return '\n'.join(lines)
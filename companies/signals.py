@@ -0,0 +1,32 @@
+# companies/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eventsaas.cache import bump_tenant_version
+from .models import Company, Domain
+from .stats import invalidate_platform_stats
+from .subscriptions import invalidate_subscription_state, update_subscription_state
+from .tenant_cache import invalidate_tenant_cache
+
+
+@receiver(post_save, sender=Company)
+def company_saved(sender, instance, **kwargs):
+    """Write the new subscription state through to the cache."""
+    update_subscription_state(instance)
+    invalidate_tenant_cache()
+    invalidate_platform_stats()
+    bump_tenant_version(instance.schema_name)
+
+
+@receiver(post_delete, sender=Company)
+def company_deleted(sender, instance, **kwargs):
+    invalidate_subscription_state(instance.schema_name)
+    invalidate_tenant_cache()
+    invalidate_platform_stats()
+    bump_tenant_version(instance.schema_name)
+
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def domain_changed(sender, instance, **kwargs):
+    invalidate_tenant_cache()
@@ -0,0 +1,39 @@
+# companies/stats.py
+"""
+Platform statistics for the public homepage.
+
+Company counts come from one conditional-aggregate query and usage totals
+from the TenantStats summary table; both are kept in the Django cache until
+a Company changes (companies/signals.py, and the admin actions that use
+queryset.update()) or collect_tenant_stats refreshes tenant usage.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from .models import Company, TenantStats
+
+CACHE_KEY = 'platform_stats'
+CACHE_TTL = getattr(settings, 'PLATFORM_STATS_CACHE_TTL', 3600)
+
+
+def compute_platform_stats():
+    stats = Company.objects.exclude(schema_name='public').aggregate(
+        total_companies=Count('id'),
+        active_companies=Count('id', filter=Q(on_trial=False)),
+        trial_companies=Count('id', filter=Q(on_trial=True)),
+    )
+    # Usage totals from the last `collect_tenant_stats` run
+    stats.update(TenantStats.objects.aggregate(
+        total_events=Sum('events', default=0),
+        total_registrations=Sum('registrations', default=0),
+    ))
+    return stats
+
+
+def get_platform_stats():
+    return cache.get_or_set(CACHE_KEY, compute_platform_stats, CACHE_TTL)
+
+
+def invalidate_platform_stats():
+    cache.delete(CACHE_KEY)
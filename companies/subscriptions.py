@@ -0,0 +1,96 @@
+# companies/subscriptions.py
+"""
+Cached subscription state per tenant schema.
+
+Lookups go through a short-lived process-local LRU first, then the Django
+cache, and only hit the public schema on a miss. Company saves write the new
+state through to both layers (see companies/signals.py); bulk admin updates
+that bypass save() call invalidate_subscription_state() explicitly.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django_tenants.utils import schema_context
+
+from eventsaas.cache import LRUCache
+from .models import Company
+
+CACHE_KEY_PREFIX = 'subscription:'
+CACHE_TTL = getattr(settings, 'SUBSCRIPTION_CACHE_TTL', 300)
+
+_local_cache = LRUCache(
+    maxsize=getattr(settings, 'SUBSCRIPTION_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'SUBSCRIPTION_CACHE_LOCAL_TTL', 5),
+)
+
+
+def _cache_key(schema_name):
+    return f'{CACHE_KEY_PREFIX}{schema_name}'
+
+
+def _state_from_company(company):
+    """Build the cached state dict; a missing company is cached as well."""
+    if company is None:
+        return {'exists': False, 'is_active_subscription': False, 'paid_until': None}
+    paid_until = Company._meta.get_field('paid_until').to_python(company.paid_until)
+    return {
+        'exists': True,
+        'is_active_subscription': company.is_active_subscription,
+        'paid_until': paid_until,
+    }
+
+
+def get_subscription_state(schema_name):
+    """Return the subscription state dict for a tenant schema."""
+    state = _local_cache.get(schema_name)
+    if state is not None:
+        return state
+
+    state = cache.get(_cache_key(schema_name))
+    if state is None:
+        with schema_context('public'):
+            company = (
+                Company.objects.filter(schema_name=schema_name)
+                .only('schema_name', 'is_active_subscription', 'paid_until')
+                .first()
+            )
+        state = _state_from_company(company)
+        cache.set(_cache_key(schema_name), state, CACHE_TTL)
+
+    _local_cache.set(schema_name, state)
+    return state
+
+
+async def aget_subscription_state(schema_name):
+    """
+    Async counterpart of get_subscription_state(). A process-local hit is
+    returned without leaving the event loop; misses run the sync lookup in
+    the request's DB thread.
+    """
+    state = _local_cache.get(schema_name)
+    if state is None:
+        state = await sync_to_async(get_subscription_state)(schema_name)
+    return state
+
+
+def is_subscription_active(state, today=None):
+    """True if the state describes an existing, paid-up subscription."""
+    if not state['exists'] or not state['is_active_subscription']:
+        return False
+    today = today or timezone.now().date()
+    return not (state['paid_until'] and state['paid_until'] < today)
+
+
+def update_subscription_state(company):
+    """Write the current state of a saved Company through to both cache layers."""
+    state = _state_from_company(company)
+    cache.set(_cache_key(company.schema_name), state, CACHE_TTL)
+    _local_cache.set(company.schema_name, state)
+
+
+def invalidate_subscription_state(*schema_names):
+    """Drop cached state so the next request reloads it from the database."""
+    cache.delete_many([_cache_key(name) for name in schema_names])
+    for name in schema_names:
+        _local_cache.delete(name)
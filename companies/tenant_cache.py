@@ -0,0 +1,59 @@
+# companies/tenant_cache.py
+"""
+Hostname → tenant cache used by CachedTenantMainMiddleware.
+
+Entries (including "no tenant for this host") live in a bounded process-local
+LRU in front of the Django cache. Shared keys are namespaced by a generation
+stamp, so invalidate_tenant_cache() drops every hostname at once whenever a
+Company or Domain changes, wherever the change was made.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from eventsaas.cache import LRUCache
+
+CACHE_KEY_PREFIX = 'tenant_domain:'
+GENERATION_KEY = 'tenant_domain:generation'
+CACHE_TTL = getattr(settings, 'TENANT_DOMAIN_CACHE_TTL', 300)
+
+# Cached in place of a tenant when the hostname has no Domain row.
+NOT_FOUND = 'not-found'
+
+_local_cache = LRUCache(
+    maxsize=getattr(settings, 'TENANT_DOMAIN_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'TENANT_DOMAIN_CACHE_LOCAL_TTL', 30),
+)
+
+
+def _generation():
+    # A timestamp rather than a counter: if the key is evicted, a new one
+    # can't collide with a generation whose entries are still cached
+    return cache.get_or_set(GENERATION_KEY, time.time_ns, None)
+
+
+def _cache_key(hostname):
+    return f'{CACHE_KEY_PREFIX}{_generation()}:{hostname}'
+
+
+def get_cached_tenant(hostname):
+    """Return the cached tenant, NOT_FOUND, or None on a cache miss."""
+    tenant = _local_cache.get(hostname)
+    if tenant is None:
+        tenant = cache.get(_cache_key(hostname))
+        if tenant is not None:
+            _local_cache.set(hostname, tenant)
+    return tenant
+
+
+def cache_tenant(hostname, tenant):
+    """Remember the tenant (or NOT_FOUND) resolved for hostname."""
+    cache.set(_cache_key(hostname), tenant, CACHE_TTL)
+    _local_cache.set(hostname, tenant)
+
+
+def invalidate_tenant_cache():
+    """Forget every cached hostname, in this process and in the shared cache."""
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+    _local_cache.clear()
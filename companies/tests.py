@@ -1,3 +1,37 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import RequestFactory
+from django_tenants.test.cases import TenantTestCase
 
-# Create your tests here.
+from .models import Company
+from .views import public_homepage
+
+
+class PublicHomepageTests(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Acme Events'
+
+    def setUp(self):
+        connection.set_schema_to_public()
+        self.request = RequestFactory().get('/')
+        self.request.tenant = Company(schema_name='public')
+
+    def test_lists_companies_with_primary_domain(self):
+        self.domain.is_primary = True
+        self.domain.save()
+
+        response = public_homepage(self.request)
+
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn('Acme Events', content)
+        self.assertIn(f'http://{self.domain.domain}:8000/', content)
+
+    def test_paginates_directory(self):
+        self.request = RequestFactory().get('/', {'page': 'not-a-number'})
+        self.request.tenant = Company(schema_name='public')
+
+        response = public_homepage(self.request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Acme Events', response.content.decode())
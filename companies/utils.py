@@ -0,0 +1,36 @@
+# companies/utils.py
+from django_tenants.utils import get_tenant, schema_context
+
+from .models import Company
+from .subscriptions import aget_subscription_state, get_subscription_state
+
+
+def get_request_company(request):
+    """
+    Return the Company row for the request's tenant (or None), loading it
+    from the public schema at most once per request. SubscriptionMiddleware
+    also exposes this lazily as request.company.
+    """
+    if not hasattr(request, '_company'):
+        tenant = get_tenant(request)
+        with schema_context('public'):
+            request._company = (
+                Company.objects.select_related('current_plan')
+                .filter(schema_name=tenant.schema_name)
+                .first()
+            )
+    return request._company
+
+
+def get_request_subscription(request):
+    """Return the cached subscription state for the request's tenant, once per request."""
+    if not hasattr(request, '_subscription'):
+        request._subscription = get_subscription_state(get_tenant(request).schema_name)
+    return request._subscription
+
+
+async def aget_request_subscription(request):
+    """Async counterpart of get_request_subscription()."""
+    if not hasattr(request, '_subscription'):
+        request._subscription = await aget_subscription_state(get_tenant(request).schema_name)
+    return request._subscription
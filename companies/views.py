@@ -1,11 +1,21 @@
 # companies/views.py
+from django.core.paginator import Paginator
+from django.db.models import Count, Prefetch, Q
 from django.shortcuts import render, redirect
 from django.http import Http404
 from .models import Company, Domain, Order, Plan
 from django_tenants.utils import get_tenant, schema_context
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.utils import timezone
+from .stats import get_platform_stats
+from .subscriptions import is_subscription_active
+from .utils import get_request_company, get_request_subscription
+
+COMPANIES_PER_PAGE = 24
+USERS_PER_PAGE = 50
+USER_LIST_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'is_superuser', 'last_login',
+)
 
 
 def public_homepage(request):
@@ -16,21 +26,24 @@ def public_homepage(request):
     if tenant.schema_name != 'public':
         raise Http404("Page not found")
     
-    # Get all companies except public schema
-    companies = Company.objects.exclude(schema_name='public').order_by('name')
-    
-    # Get company stats
-    total_companies = companies.count()
-    active_companies = companies.filter(on_trial=False).count()
-    trial_companies = companies.filter(on_trial=True).count()
+    # Directory page: only the displayed columns, primary domains in one
+    # extra query for the whole page
+    companies = (
+        Company.objects.exclude(schema_name='public')
+        .select_related('stats')
+        .only('name', 'schema_name', 'description', 'logo', 'contact_email',
+              'on_trial', 'is_active_subscription', 'created_at', 'stats__upcoming_events')
+        .prefetch_related(Prefetch(
+            'domains', queryset=Domain.objects.filter(is_primary=True), to_attr='primary_domains',
+        ))
+        .order_by('name')
+    )
+    page = Paginator(companies, COMPANIES_PER_PAGE).get_page(request.GET.get('page'))
     
     context = {
-        'companies': companies,
-        'stats': {
-            'total_companies': total_companies,
-            'active_companies': active_companies,
-            'trial_companies': trial_companies,
-        }
+        'companies': page,
+        'page': page,
+        'stats': get_platform_stats(),
     }
     
     return render(request, 'companies/public_homepage.html', context)
@@ -89,37 +102,42 @@ def company_users(request, schema_name):
 
     User = get_user_model()
 
-    # 4) Switch into the target tenant's schema and fetch its users:
+    # 4) Switch into the target tenant's schema and fetch one page of users,
+    # keyset-paginated on the unique username (?after= / ?before=):
+    after, before = request.GET.get('after'), request.GET.get('before')
     with schema_context(company.schema_name):
-        # Fetch all users from the tenant's schema
-        users = User.objects.all().order_by("username")
-        
-        # Add some additional user info for better display
-        users_list = []
-        for user in users:
-            user_data = {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'is_staff': user.is_staff,
-                'is_superuser': user.is_superuser,
-                'is_active': user.is_active,
-                'last_login': user.last_login,
-                'date_joined': user.date_joined,
-            }
-            users_list.append(user_data)
+        counts = User.objects.aggregate(
+            total_users=Count('id'),
+            active_users=Count('id', filter=Q(is_active=True)),
+            staff_users=Count('id', filter=Q(is_staff=True)),
+            superusers=Count('id', filter=Q(is_superuser=True)),
+        )
+
+        users = User.objects.values(*USER_LIST_FIELDS)
+        if before:
+            users = users.filter(username__lt=before).order_by('-username')
+        elif after:
+            users = users.filter(username__gt=after).order_by('username')
+        else:
+            users = users.order_by('username')
+        users = list(users[:USERS_PER_PAGE + 1])
+
+    has_more = len(users) > USERS_PER_PAGE
+    users = users[:USERS_PER_PAGE]
+    if before:
+        users.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, bool(after)
 
     # 5) Render with additional context for public admin:
     context = {
         'company': company,
-        'users': users_list,
+        'users': users,
         'is_public_admin': request_tenant.schema_name == "public",
-        'total_users': len(users_list),
-        'active_users': len([u for u in users_list if u['is_active']]),
-        'staff_users': len([u for u in users_list if u['is_staff']]),
-        'superusers': len([u for u in users_list if u['is_superuser']]),
+        'next_after': users[-1]['username'] if users and has_next else None,
+        'previous_before': users[0]['username'] if users and has_previous else None,
+        **counts,
     }
     
     return render(request, "companies/company_users.html", context)
@@ -135,13 +153,11 @@ def view_plans(request):
         # Public schema should not see this page
         raise Http404("Page not found")
 
-    # Fetch Company record from PUBLIC schema
-    with schema_context('public'):
-        try:
-            company = Company.objects.get(schema_name=tenant.schema_name)
-        except Company.DoesNotExist:
-            raise Http404("Company not found in public schema")
+    company = get_request_company(request)
+    if company is None:
+        raise Http404("Company not found in public schema")
 
+    with schema_context('public'):
         plans = Plan.objects.filter(is_active=True)
 
     return render(request, 'companies/plans.html', {
@@ -167,12 +183,15 @@ def tenant_order(request):
     if not plan_id:
         return redirect('view_plans')
 
+    company = get_request_company(request)
+    if company is None:
+        raise Http404("Invalid company or plan")
+
     # In PUBLIC schema, create a new Order tied to this Company
     with schema_context('public'):
         try:
-            company = Company.objects.get(schema_name=tenant.schema_name)
             plan = Plan.objects.get(pk=plan_id, is_active=True)
-        except (Company.DoesNotExist, Plan.DoesNotExist):
+        except Plan.DoesNotExist:
             raise Http404("Invalid company or plan")
 
         total = plan.price
@@ -207,13 +226,12 @@ def view_orders(request):
     if tenant.schema_name == 'public':
         raise Http404("Page not found")
 
-    with schema_context('public'):
-        try:
-            company = Company.objects.get(schema_name=tenant.schema_name)
-        except Company.DoesNotExist:
-            raise Http404("Company not found")
+    company = get_request_company(request)
+    if company is None:
+        raise Http404("Company not found")
 
-        orders = Order.objects.filter(company=company).order_by('-created_at')
+    with schema_context('public'):
+        orders = Order.objects.filter(company=company).select_related('plan').order_by('-created_at')
 
     return render(request, 'companies/tenant_orders.html', {
         'company': company,
@@ -229,24 +247,16 @@ def subscription_check(request):
     tenant = get_tenant(request)
     next_url = request.GET.get('next', '/')
     
+    # Check against the same cached state SubscriptionMiddleware uses, so the
+    # two never disagree and bounce the user back and forth
+    if is_subscription_active(get_request_subscription(request)):
+        return redirect(next_url)
+
     # Get company info
-    try:
-        with schema_context('public'):
-            company = Company.objects.get(schema_name=tenant.schema_name)
-    except Company.DoesNotExist:
+    company = get_request_company(request)
+    if company is None:
         return render(request, 'subscriptions/company_not_found.html', status=404)
 
-    # Check if subscription is actually active now
-    now_date = timezone.now().date()
-    is_active = (
-        company.is_active_subscription and
-        (not company.paid_until or company.paid_until >= now_date)
-    )
-
-    # If subscription became active, redirect to original destination
-    if is_active:
-        return redirect(next_url)
-
     # Get user's orders if authenticated
     orders = None
     if request.user.is_authenticated:
@@ -1,13 +1,14 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django_tenants.utils import get_tenant
-from .models import Event, Registration
+from .exports import export_response
+from .models import Event, Notification, Registration, RegistrationRequest
 
 class TenantEventAdmin(admin.ModelAdmin):
     list_display = ('title', 'start_date', 'status', 'registration_count', 'max_attendees', 'created_by')
-    list_filter = ('status', 'start_date', 'created_at')
+    list_filter = ('status', 'recurrence', 'start_date', 'created_at')
     search_fields = ('title', 'description', 'location')
-    readonly_fields = ('created_at', 'updated_at', 'registration_count')
+    readonly_fields = ('created_at', 'updated_at', 'registration_count', 'waitlist_count', 'series')
     
     fieldsets = (
         ('Event Details', {
@@ -16,8 +17,13 @@ class TenantEventAdmin(admin.ModelAdmin):
         ('Schedule', {
             'fields': ('start_date', 'end_date', 'registration_deadline')
         }),
+        ('Recurrence', {
+            'fields': ('recurrence', 'recurrence_interval', 'recurrence_until', 'series'),
+            'description': 'Occurrences are saved as their own events once someone registers; '
+                           'later changes to the series only apply to occurrences not saved yet.',
+        }),
         ('Registration', {
-            'fields': ('max_attendees', 'registration_count')
+            'fields': ('max_attendees', 'use_registration_queue', 'registration_count', 'waitlist_count')
         }),
         ('Meta', {
             'fields': ('created_by', 'created_at', 'updated_at'),
@@ -25,16 +31,25 @@ class TenantEventAdmin(admin.ModelAdmin):
         }),
     )
 
+    actions = ['export_registrations_csv']
+
+    def export_registrations_csv(self, request, queryset):
+        """Stream the registrations of the selected events as CSV."""
+        registrations = Registration.objects.filter(event__in=queryset)
+        return export_response(registrations, 'registrations', 'csv')
+    export_registrations_csv.short_description = 'Export registrations of selected events (CSV)'
+
     def save_model(self, request, obj, form, change):
         if not change:  # If creating new event
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
 
     def registration_count(self, obj):
-        count = obj.registrations.filter(status='confirmed').count()
+        count = obj.confirmed_count
         total = obj.max_attendees or "∞"
         return format_html(f'<strong>{count}/{total}</strong>')
     registration_count.short_description = 'Registrations'
+    registration_count.admin_order_field = 'confirmed_count'
     
     def has_module_permission(self, request):
         """Only show events admin in tenant schemas (not public)"""
@@ -52,6 +67,38 @@ class TenantRegistrationAdmin(admin.ModelAdmin):
         tenant = get_tenant(request)
         return tenant.schema_name != 'public'
 
+class TenantRegistrationRequestAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event', 'status', 'created_at', 'processed_at')
+    list_filter = ('status',)
+    search_fields = ('user__username', 'event__title')
+    readonly_fields = ('event', 'user', 'notes', 'status', 'created_at', 'processed_at')
+
+    def has_add_permission(self, request):
+        # Requests come from the registration view; the worker processes them
+        return False
+
+    def has_module_permission(self, request):
+        """Only show the registration queue in tenant schemas"""
+        tenant = get_tenant(request)
+        return tenant.schema_name != 'public'
+
+class TenantNotificationAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'user', 'event', 'send_after', 'sent_at', 'attempts')
+    list_filter = ('kind', 'sent_at')
+    search_fields = ('user__username', 'user__email', 'event__title')
+    readonly_fields = ('event', 'user', 'kind', 'created_at', 'sent_at', 'attempts', 'last_error')
+
+    def has_add_permission(self, request):
+        # Queued by registration changes; sent by dispatch_notifications
+        return False
+
+    def has_module_permission(self, request):
+        """Only show the notification outbox in tenant schemas"""
+        tenant = get_tenant(request)
+        return tenant.schema_name != 'public'
+
 # Register only in tenant schemas
 admin.site.register(Event, TenantEventAdmin)
-admin.site.register(Registration, TenantRegistrationAdmin)
\ No newline at end of file
+admin.site.register(Registration, TenantRegistrationAdmin)
+admin.site.register(RegistrationRequest, TenantRegistrationRequestAdmin)
+admin.site.register(Notification, TenantNotificationAdmin)
\ No newline at end of file
@@ -1,6 +1,10 @@
 # events/context_processors.py
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 from django_tenants.utils import get_tenant
 
+from eventsaas.cache import get_tenant_version
+
 def tenant_context(request):
     """Add tenant information to all template contexts"""
     try:
@@ -9,10 +13,18 @@ def tenant_context(request):
             'tenant': tenant,
             'company_name': tenant.name if tenant.schema_name != 'public' else 'EventSaaS Admin',
             'is_public_schema': tenant.schema_name == 'public',
+            # Lazy, memoized per request by SubscriptionMiddleware
+            'company': getattr(request, 'company', None),
+            # For {% cache %} keys; only looked up if a template uses it
+            'content_version': SimpleLazyObject(lambda: get_tenant_version(tenant.schema_name)),
+            'fragment_cache_ttl': settings.TEMPLATE_FRAGMENT_CACHE_TTL,
         }
     except:
         return {
             'tenant': None,
             'company_name': 'EventSaaS',
             'is_public_schema': True,
+            'company': None,
+            'content_version': None,
+            'fragment_cache_ttl': settings.TEMPLATE_FRAGMENT_CACHE_TTL,
         }
\ No newline at end of file
@@ -0,0 +1,62 @@
+# events/counters.py
+"""
+Helpers for the denormalized Event.confirmed_count / Event.waitlist_count
+columns. Every change is a single atomic UPDATE using F() expressions, so
+concurrent registrations never lose increments.
+"""
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Event, Registration
+
+# Registration.status -> Event counter column
+COUNTER_FIELDS = {
+    'confirmed': 'confirmed_count',
+    'waitlist': 'waitlist_count',
+}
+
+
+def adjust_registration_counts(event_id, status, delta):
+    """Add delta to the counter tracking status on the given event (if any)."""
+    field = COUNTER_FIELDS.get(status)
+    if field is None or not delta:
+        return
+    Event.objects.filter(pk=event_id).update(**{field: Greatest(F(field) + delta, 0)})
+
+
+def _count_subquery(status):
+    return Coalesce(
+        Subquery(
+            Registration.objects.filter(event=OuterRef('pk'), status=status)
+            .order_by()
+            .values('event')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+def reconcile_registration_counts(events=None):
+    """
+    Recompute the counters from the Registration table for events whose stored
+    values drifted (bulk inserts, raw SQL, ...). Returns the number of events fixed.
+    """
+    if events is None:
+        events = Event.objects.all()
+
+    drifted = (
+        events.annotate(
+            actual_confirmed=_count_subquery('confirmed'),
+            actual_waitlist=_count_subquery('waitlist'),
+        )
+        .filter(
+            ~Q(confirmed_count=F('actual_confirmed'))
+            | ~Q(waitlist_count=F('actual_waitlist'))
+        )
+        .values('pk')
+    )
+    return Event.objects.filter(pk__in=drifted).update(
+        confirmed_count=_count_subquery('confirmed'),
+        waitlist_count=_count_subquery('waitlist'),
+    )
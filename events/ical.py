@@ -0,0 +1,193 @@
+# events/ical.py
+"""
+iCalendar (.ics) feeds of a tenant's published events and of a user's
+registrations.
+
+Each feed is built from one values() query and cached under the tenant
+content version (see eventsaas/cache.py), so any Event/Registration write
+invalidates it. The cached entry carries an ETag, so calendar apps that
+poll the feed mostly get a 304 without the database being touched.
+"""
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from eventsaas.cache import get_tenant_version
+from .models import Event, Registration
+from .recurrence import virtual_occurrences
+
+CACHE_TTL = getattr(settings, 'ICAL_CACHE_TTL', 3600)
+# Feeds include events that ended up to this many days ago
+PAST_DAYS = getattr(settings, 'ICAL_PAST_DAYS', 90)
+CONTENT_TYPE = 'text/calendar; charset=utf-8'
+
+REGISTRATION_STATUS = {'confirmed': 'CONFIRMED', 'waitlist': 'TENTATIVE'}
+
+
+def escape(text):
+    """Escape a TEXT property value (RFC 5545 3.3.11)."""
+    return (
+        text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets, continuation lines start with a space."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Don't split a multi-byte character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74
+    return '\r\n '.join(parts)
+
+
+def format_datetime(value):
+    return value.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def event_uid(row, schema_name):
+    # Built from the schema rather than the request host, so a tenant with
+    # several domains serves (and caches) the same UIDs on all of them.
+    # Occurrences of a series keep the same UID whether saved or not.
+    if row['series_id']:
+        return f'occurrence-{row["series_id"]}-{int(row["start_date"].timestamp())}@{schema_name}.eventsaas'
+    return f'event-{row["id"]}@{schema_name}.eventsaas'
+
+
+def render_event(row, schema_name, status):
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{event_uid(row, schema_name)}',
+        f'DTSTAMP:{format_datetime(row["updated_at"])}',
+        f'DTSTART:{format_datetime(row["start_date"])}',
+        f'DTEND:{format_datetime(row["end_date"])}',
+        f'SUMMARY:{escape(row["title"])}',
+        f'DESCRIPTION:{escape(row["description"])}',
+        f'STATUS:{status}',
+    ]
+    if row['location']:
+        lines.append(f'LOCATION:{escape(row["location"])}')
+    lines.append('END:VEVENT')
+    return lines
+
+
+def render_calendar(name, events):
+    """`events` is an iterable of VEVENT line lists."""
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//EventSaaS//Events//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{escape(name)}',
+    ]
+    for event in events:
+        lines.extend(event)
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(fold(line) for line in lines) + '\r\n'
+
+
+EVENT_FIELDS = (
+    'id', 'series_id', 'title', 'description', 'location', 'start_date', 'end_date', 'updated_at',
+)
+
+
+def _since():
+    return timezone.now() - datetime.timedelta(days=PAST_DAYS)
+
+
+def occurrence_row(event):
+    row = {name: getattr(event, name) for name in EVENT_FIELDS}
+    row['updated_at'] = event.series.updated_at
+    return row
+
+
+def events_calendar(tenant):
+    published = Event.objects.filter(status='published')
+    rows = list(
+        published.filter(recurrence='', end_date__gte=_since())
+        .order_by('start_date')
+        .values(*EVENT_FIELDS)
+    )
+    # Series are expanded up to the recurrence horizon
+    occurrences = virtual_occurrences(published, _since(), None)
+    rows = sorted(rows + [occurrence_row(event) for event in occurrences], key=lambda row: row['start_date'])
+    return render_calendar(tenant.name, (render_event(row, tenant.schema_name, 'CONFIRMED') for row in rows))
+
+
+def registrations_calendar(tenant, user):
+    rows = (
+        Registration.objects.filter(
+            user=user, status__in=REGISTRATION_STATUS, event__end_date__gte=_since(),
+        )
+        .exclude(event__status='draft')
+        .order_by('event__start_date')
+        .values('status', 'event__status', *(f'event__{name}' for name in EVENT_FIELDS))
+    )
+    events = []
+    for row in rows:
+        event = {name: row[f'event__{name}'] for name in EVENT_FIELDS}
+        # A cancelled event wins over the registration status
+        if row['event__status'] == 'cancelled':
+            status = 'CANCELLED'
+        else:
+            status = REGISTRATION_STATUS[row['status']]
+        events.append(render_event(event, tenant.schema_name, status))
+    return render_calendar(f'{tenant.name} - {user.username}', events)
+
+
+# Per-user feeds are reached through a signed token instead of a session,
+# because calendar apps can't log in. The salt includes the schema since
+# user ids are only unique within a tenant.
+
+def _signer():
+    return signing.Signer(salt=f'events.ical:{connection.schema_name}')
+
+
+def make_feed_token(user):
+    return _signer().sign(str(user.pk))
+
+
+def user_id_from_token(token):
+    """Return the user id for a feed token, or None if it doesn't verify."""
+    try:
+        return int(_signer().unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def feed_response(request, feed, build, private=False):
+    """
+    Serve a feed from the cache (or build() it), answering conditional
+    requests with a 304. `feed` names the cache entry within the tenant.
+    """
+    schema_name = connection.schema_name
+    key = f'ical:{schema_name}:{get_tenant_version(schema_name)}:{feed}'
+    entry = cache.get(key)
+    if entry is None:
+        body = build()
+        entry = {'body': body, 'etag': '"%s"' % hashlib.md5(body.encode()).hexdigest()}
+        cache.set(key, entry, CACHE_TTL)
+
+    response = get_conditional_response(request, etag=entry['etag'])
+    if response is None:
+        response = HttpResponse(entry['body'], content_type=CONTENT_TYPE)
+        response['Content-Disposition'] = 'inline; filename="calendar.ics"'
+    response['ETag'] = entry['etag']
+    patch_cache_control(response, no_cache=True)
+    if private:
+        patch_cache_control(response, private=True)
+    return response
@@ -0,0 +1,66 @@
+# events/management/commands/dispatch_notifications.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import schema_context
+from companies.models import Company
+from events.notifications import dispatch_due
+
+
+class Command(BaseCommand):
+    help = (
+        'Send due registration notices and event reminders from the notification '
+        'outbox of every tenant, one email connection per batch. Run with --loop '
+        'as a long-lived worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, help='Only dispatch for this tenant schema')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Notifications claimed and sent per batch (default: 100)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for due notifications instead of exiting')
+        parser.add_argument('--sleep', type=float, default=10.0,
+                            help='Seconds to wait between polls when nothing is due (default: 10)')
+
+    def handle(self, *args, **options):
+        companies = Company.objects.exclude(schema_name='public').order_by('schema_name')
+        if options['schema']:
+            companies = companies.filter(schema_name=options['schema'])
+            if not companies.exists():
+                raise CommandError(f'No tenant with schema "{options["schema"]}"')
+
+        # Name and link base per tenant, resolved once
+        scheme = getattr(settings, 'NOTIFICATION_URL_SCHEME', 'https')
+        tenants = []
+        for company in companies:
+            domain = company.get_primary_domain()
+            base_url = f'{scheme}://{domain.domain}' if domain else ''
+            tenants.append((company.schema_name, company.name, base_url))
+
+        while True:
+            sent = sum(self.dispatch(*tenant, options['batch_size']) for tenant in tenants)
+            if not options['loop']:
+                break
+            if not sent:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS('✓ Notifications dispatched'))
+
+    def dispatch(self, schema_name, site_name, base_url, batch_size):
+        """Send batches in one tenant until nothing is due; returns the number handled."""
+        totals = [0, 0, 0, 0]
+        with schema_context(schema_name):
+            while True:
+                counts = dispatch_due(batch_size, site_name, base_url)
+                if not any(counts):
+                    break
+                totals = [total + count for total, count in zip(totals, counts)]
+
+        sent, failed, skipped, rescheduled = totals
+        if any(totals):
+            line = (f'{schema_name}: sent {sent}, failed {failed}, skipped {skipped}, '
+                    f'rescheduled {rescheduled}')
+            self.stdout.write(self.style.WARNING(line) if failed else line)
+        return sent + skipped + rescheduled
@@ -0,0 +1,205 @@
+# events/management/commands/import_registrations.py
+import csv
+import io
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django_tenants.utils import schema_context
+from companies.models import Company
+from eventsaas.cache import bump_tenant_version
+from events.counters import reconcile_registration_counts
+from events.models import Event, Registration
+
+STATUSES = {value for value, _ in Registration.STATUS_CHOICES}
+STAGING_TABLE = 'registration_import'
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import registrations into a tenant from a CSV file with columns '
+        'event_id, username[, email, status, notes]. Rows are COPYed into a staging '
+        'table and upserted in one statement; missing users are created.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('schema', type=str, help='Tenant schema name')
+        parser.add_argument('file', type=str, help='CSV file to import')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows resolved and copied per batch (default: 5000)')
+        parser.add_argument('--rejects', type=str,
+                            help='Write rejected rows with the reason to this CSV file')
+
+    def handle(self, *args, **options):
+        schema_name = options['schema']
+        if schema_name == 'public' or not Company.objects.filter(schema_name=schema_name).exists():
+            raise CommandError(f'No tenant with schema "{schema_name}"')
+
+        started = time.monotonic()
+        self.rejected = []
+
+        try:
+            with open(options['file'], newline='', encoding='utf-8') as handle:
+                reader = csv.DictReader(handle)
+                missing = {'event_id', 'username'} - set(reader.fieldnames or [])
+                if missing:
+                    raise CommandError(f'Missing CSV column(s): {", ".join(sorted(missing))}')
+
+                with schema_context(schema_name), transaction.atomic():
+                    self.create_staging_table()
+                    read = self.load_staging(reader, options['batch_size'])
+                    inserted, updated, event_ids = self.upsert()
+                    # COPY and the upsert bypass the counter signals
+                    reconcile_registration_counts(Event.objects.filter(pk__in=event_ids))
+        except OSError as e:
+            raise CommandError(f'Cannot read {options["file"]}: {e}')
+
+        bump_tenant_version(schema_name)
+        if options['rejects'] and self.rejected:
+            self.write_rejects(options['rejects'])
+
+        elapsed = time.monotonic() - started
+        rate = read / elapsed if elapsed else read
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Imported {read} row(s) into {schema_name} in {elapsed:.2f}s ({rate:,.0f} rows/s)'
+        ))
+        self.stdout.write(f'  inserted: {inserted}, updated: {updated}, rejected: {len(self.rejected)}')
+        for line, reason in self.rejected[:10]:
+            self.stdout.write(self.style.WARNING(f'  line {line}: {reason}'))
+        if len(self.rejected) > 10 and not options['rejects']:
+            self.stdout.write('  ... use --rejects FILE to see every rejected row')
+
+    def create_staging_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'''
+                CREATE TEMP TABLE {STAGING_TABLE} (
+                    line integer NOT NULL,
+                    event_id bigint NOT NULL,
+                    user_id integer NOT NULL,
+                    status varchar(20) NOT NULL,
+                    notes text NOT NULL
+                ) ON COMMIT DROP
+            ''')
+
+    def load_staging(self, reader, batch_size):
+        """Validate rows, resolve users batch by batch and COPY them into staging."""
+        read = 0
+        batch = []
+        for row in reader:
+            read += 1
+            line = reader.line_num
+            try:
+                batch.append(self.clean_row(line, row))
+            except ValueError as e:
+                self.rejected.append((line, str(e)))
+            if len(batch) >= batch_size:
+                self.copy_batch(batch)
+                batch = []
+        if batch:
+            self.copy_batch(batch)
+        return read
+
+    def clean_row(self, line, row):
+        try:
+            event_id = int(row['event_id'])
+        except (TypeError, ValueError):
+            raise ValueError(f'invalid event_id {row["event_id"]!r}')
+        username = (row['username'] or '').strip()
+        if not username or len(username) > 150:
+            raise ValueError(f'invalid username {username!r}')
+        status = (row.get('status') or 'confirmed').strip()
+        if status not in STATUSES:
+            raise ValueError(f'invalid status {status!r}')
+        return {
+            'line': line,
+            'event_id': event_id,
+            'username': username,
+            'email': (row.get('email') or '').strip(),
+            'status': status,
+            'notes': row.get('notes') or '',
+        }
+
+    def resolve_users(self, batch):
+        """Map username -> id, creating the users that don't exist yet."""
+        User = get_user_model()
+        usernames = {row['username'] for row in batch}
+        user_ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+
+        new_users = []
+        emails = {row['username']: row['email'] for row in batch}
+        for username in usernames - user_ids.keys():
+            user = User(username=username, email=emails[username])
+            user.set_unusable_password()
+            new_users.append(user)
+        if new_users:
+            User.objects.bulk_create(new_users, ignore_conflicts=True)
+            user_ids.update(
+                User.objects.filter(username__in=[u.username for u in new_users])
+                .values_list('username', 'id')
+            )
+        return user_ids
+
+    def copy_batch(self, batch):
+        user_ids = self.resolve_users(batch)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow([row['line'], row['event_id'], user_ids[row['username']],
+                             row['status'], row['notes']])
+        buffer.seek(0)
+
+        sql = f'COPY {STAGING_TABLE} (line, event_id, user_id, status, notes) FROM STDIN WITH (FORMAT csv)'
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):  # psycopg2
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def upsert(self):
+        """
+        Move staging rows into the registration table in one statement. Rows
+        for unknown events are rejected; if a user appears twice for an event
+        the last line wins.
+        """
+        registrations = Registration._meta.db_table
+        events = Event._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f'''
+                SELECT s.line, s.event_id FROM {STAGING_TABLE} s
+                WHERE NOT EXISTS (SELECT 1 FROM {events} e WHERE e.id = s.event_id)
+                ORDER BY s.line
+            ''')
+            for line, event_id in cursor.fetchall():
+                self.rejected.append((line, f'unknown event_id {event_id}'))
+
+            cursor.execute(f'''
+                WITH upserted AS (
+                    INSERT INTO {registrations}
+                        (event_id, user_id, status, notes, registered_at, updated_at)
+                    SELECT DISTINCT ON (s.event_id, s.user_id)
+                        s.event_id, s.user_id, s.status, s.notes, now(), now()
+                    FROM {STAGING_TABLE} s
+                    JOIN {events} e ON e.id = s.event_id
+                    ORDER BY s.event_id, s.user_id, s.line DESC
+                    ON CONFLICT (event_id, user_id) DO UPDATE
+                        SET status = EXCLUDED.status,
+                            notes = EXCLUDED.notes,
+                            updated_at = EXCLUDED.updated_at
+                    RETURNING (xmax = 0) AS inserted, event_id
+                )
+                SELECT count(*) FILTER (WHERE inserted),
+                       count(*) FILTER (WHERE NOT inserted),
+                       coalesce(array_agg(DISTINCT event_id), '{{}}')
+                FROM upserted
+            ''')
+            return cursor.fetchone()
+
+    def write_rejects(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['line', 'reason'])
+            writer.writerows(self.rejected)
+        self.stdout.write(f'Rejected rows written to {path}')
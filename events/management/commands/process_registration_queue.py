@@ -0,0 +1,92 @@
+# events/management/commands/process_registration_queue.py
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+from django.utils import timezone
+from django_tenants.utils import schema_context
+from companies.models import Company
+from events.models import RegistrationRequest
+
+# Seconds between purges of old processed requests when running with --loop
+PURGE_INTERVAL = 3600
+
+# A batch that fails with a deadlock or serialization error is rolled back
+# and its requests stay pending; retry it this many times in a row
+MAX_RETRIES = 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Turn queued registration requests into registrations, in arrival order, '
+        'for every tenant. Run with --loop as a long-lived worker; several workers '
+        'can run side by side.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, help='Only process this tenant schema')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Requests claimed per transaction (default: 500)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for new requests instead of exiting when drained')
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help='Seconds to wait between polls when the queue is empty (default: 1)')
+        parser.add_argument('--keep-days', type=int, default=7,
+                            help='Delete processed requests older than this many days (default: 7)')
+
+    def handle(self, *args, **options):
+        companies = Company.objects.exclude(schema_name='public').order_by('schema_name')
+        if options['schema']:
+            companies = companies.filter(schema_name=options['schema'])
+            if not companies.exists():
+                raise CommandError(f'No tenant with schema "{options["schema"]}"')
+        schema_names = list(companies.values_list('schema_name', flat=True))
+
+        last_purge = None
+        while True:
+            processed = sum(self.drain(schema_name, options) for schema_name in schema_names)
+            if last_purge is None or time.monotonic() - last_purge > PURGE_INTERVAL:
+                for schema_name in schema_names:
+                    self.purge(schema_name, options['keep_days'])
+                last_purge = time.monotonic()
+            if not options['loop']:
+                break
+            if not processed:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS('✓ Registration queue drained'))
+
+    def drain(self, schema_name, options):
+        """Process batches in one tenant until its queue is empty."""
+        total = 0
+        started = time.monotonic()
+        retries = 0
+        with schema_context(schema_name):
+            while True:
+                try:
+                    processed = RegistrationRequest.objects.process_pending(options['batch_size'])
+                except OperationalError as e:
+                    retries += 1
+                    if retries > MAX_RETRIES:
+                        raise
+                    self.stdout.write(self.style.WARNING(f'{schema_name}: batch rolled back, retrying: {e}'))
+                    time.sleep(0.1 * retries)
+                    continue
+                retries = 0
+                if not processed:
+                    break
+                total += processed
+
+        if total:
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'{schema_name}: processed {total} request(s) in {elapsed:.2f}s')
+        return total
+
+    def purge(self, schema_name, keep_days):
+        with schema_context(schema_name):
+            purged = RegistrationRequest.objects.purge_processed(
+                timezone.now() - datetime.timedelta(days=keep_days)
+            )
+        if purged:
+            self.stdout.write(f'{schema_name}: purged {purged} old request(s)')
@@ -0,0 +1,31 @@
+# events/management/commands/reconcile_registration_counts.py
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import schema_context
+from companies.models import Company
+from events.counters import reconcile_registration_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute Event.confirmed_count / waitlist_count from registrations in every tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, help='Only reconcile this tenant schema')
+
+    def handle(self, *args, **options):
+        companies = Company.objects.exclude(schema_name='public').order_by('schema_name')
+        if options['schema']:
+            companies = companies.filter(schema_name=options['schema'])
+            if not companies.exists():
+                raise CommandError(f'No tenant with schema "{options["schema"]}"')
+
+        total = 0
+        for schema_name in companies.values_list('schema_name', flat=True):
+            with schema_context(schema_name):
+                fixed = reconcile_registration_counts()
+            total += fixed
+            if fixed:
+                self.stdout.write(self.style.WARNING(f'{schema_name}: fixed {fixed} event(s)'))
+            else:
+                self.stdout.write(f'{schema_name}: counts OK')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Reconciled registration counts ({total} event(s) fixed)'))
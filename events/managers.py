@@ -0,0 +1,289 @@
+# events/managers.py
+import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from eventsaas.cache import bump_tenant_version
+
+
+REMINDER_BEFORE = datetime.timedelta(hours=getattr(settings, 'EVENT_REMINDER_HOURS', 24))
+
+
+def notifications():
+    """Notification manager; looked up lazily since models.py imports this module."""
+    return apps.get_model('events', 'Notification').objects
+
+
+def has_free_seat():
+    """Filter matching events with unlimited capacity or a seat left."""
+    return (
+        Q(max_attendees__isnull=True)
+        | Q(max_attendees=0)
+        | Q(confirmed_count__lt=F('max_attendees'))
+    )
+
+
+class RegistrationManager(models.Manager):
+    """
+    Capacity-safe registration. Seats are reserved with one conditional
+    UPDATE on the event row, which both checks and takes the seat, so
+    concurrent requests can never oversell max_attendees. Because the
+    counters are adjusted here, the registrations saved by these methods are
+    flagged so the counter signals leave them alone.
+    """
+
+    @property
+    def event_model(self):
+        return self.model._meta.get_field('event').related_model
+
+    def _save_counted(self, registration, **kwargs):
+        registration._skip_counter_update = True
+        try:
+            registration.save(**kwargs)
+        finally:
+            registration._skip_counter_update = False
+
+    def register(self, event, user, notes=''):
+        """
+        Register user for event: confirmed if a seat is free, otherwise
+        waitlisted. Returns (registration, created); created is False when the
+        user already holds a confirmed or waitlisted registration.
+        """
+        try:
+            with transaction.atomic():
+                registration = self.select_for_update().filter(event=event, user=user).first()
+                if registration is not None and registration.status != 'cancelled':
+                    return registration, False
+
+                seat_reserved = self.event_model.objects.filter(pk=event.pk).filter(
+                    has_free_seat()
+                ).update(confirmed_count=F('confirmed_count') + 1)
+                if seat_reserved:
+                    status = 'confirmed'
+                else:
+                    status = 'waitlist'
+                    self.event_model.objects.filter(pk=event.pk).update(
+                        waitlist_count=F('waitlist_count') + 1
+                    )
+
+                if registration is None:
+                    registration = self.model(event=event, user=user, notes=notes)
+                registration.status = status
+                self._save_counted(registration)
+                notifications().queue_registration_notices(event, [registration])
+                return registration, True
+        except IntegrityError:
+            # A concurrent request from the same user won the unique
+            # (event, user) insert; our seat reservation was rolled back.
+            return self.get(event=event, user=user), False
+
+    def cancel(self, registration):
+        """
+        Delete registration and, if it held a seat, promote the oldest
+        waitlisted registration into it. Returns the promoted registration
+        or None.
+        """
+        with transaction.atomic():
+            # Re-read under lock: a concurrent cancel may already have deleted
+            # it (post_delete fires even when the DELETE matches no row), or
+            # it may have been promoted since the caller loaded it.
+            registration = self.select_for_update().filter(pk=registration.pk).first()
+            if registration is None:
+                return None
+            was_confirmed = registration.status == 'confirmed'
+            # The post_delete signal releases the seat; its UPDATE also locks
+            # the event row until commit, so nobody can jump the waitlist.
+            registration.delete()
+            notifications().queue_cancellation(registration.event_id, registration.user_id)
+            if not was_confirmed:
+                return None
+            return self.promote_waitlisted(registration.event_id)
+
+    def promote_waitlisted(self, event_id):
+        """Move the oldest waitlisted registration into a free seat, if any."""
+        with transaction.atomic():
+            candidate = (
+                self.select_for_update(skip_locked=True)
+                .filter(event_id=event_id, status='waitlist')
+                .order_by('registered_at', 'pk')
+                .first()
+            )
+            if candidate is None:
+                return None
+
+            seat_reserved = self.event_model.objects.filter(pk=event_id).filter(
+                has_free_seat()
+            ).update(
+                confirmed_count=F('confirmed_count') + 1,
+                waitlist_count=Greatest(F('waitlist_count') - 1, 0),
+            )
+            if not seat_reserved:
+                return None
+
+            candidate.status = 'confirmed'
+            self._save_counted(candidate, update_fields=['status', 'updated_at'])
+            notifications().queue_registration_notices(candidate.event, [candidate], kind='promoted')
+            return candidate
+
+
+class RegistrationRequestManager(models.Manager):
+    """
+    DB-backed intake queue for events with use_registration_queue on. During
+    a ticket drop the web tier only inserts requests, so it never contends
+    on the event row; `manage.py process_registration_queue` drains them in
+    batches, one event lock per event per batch instead of one per request.
+    """
+
+    @property
+    def event_model(self):
+        return self.model._meta.get_field('event').related_model
+
+    def enqueue(self, event, user, notes=''):
+        """
+        Queue a registration request. Returns (request, created); a user has
+        at most one pending request per event.
+        """
+        try:
+            with transaction.atomic():
+                return self.create(event=event, user=user, notes=notes), True
+        except IntegrityError:
+            return self.latest_for(event, user), False
+
+    def latest_for(self, event, user):
+        return self.filter(event=event, user=user).order_by('-id').first()
+
+    def process_pending(self, batch_size=500):
+        """
+        Claim up to batch_size pending requests and turn them into
+        registrations in arrival order. Rows are claimed with SKIP LOCKED,
+        so several workers can drain the queue side by side. Returns the
+        number of requests processed.
+        """
+        with transaction.atomic():
+            claimed = list(
+                self.select_for_update(skip_locked=True)
+                .filter(status='pending')
+                .order_by('id')[:batch_size]
+            )
+            if not claimed:
+                return 0
+
+            by_event = {}
+            for request in claimed:
+                by_event.setdefault(request.event_id, []).append(request)
+            now = timezone.now()
+            # Lock events in a fixed order so workers with overlapping
+            # batches can't deadlock on each other
+            for event_id in sorted(by_event):
+                self._assign(event_id, by_event[event_id], now)
+
+            for request in claimed:
+                request.processed_at = now
+            self.bulk_update(claimed, ['status', 'processed_at'])
+
+        # Bulk writes don't send the signals that bump the version
+        bump_tenant_version(connection.schema_name)
+        return len(claimed)
+
+    def _assign(self, event_id, requests, now):
+        """Confirm requests while seats last, waitlist the rest."""
+        registration_model = apps.get_model('events', 'Registration')
+        # Serializes with RegistrationManager.register()/cancel() on this event
+        event = self.event_model.objects.select_for_update().get(pk=event_id)
+        if not event.is_accepting_registrations:
+            for request in requests:
+                request.status = 'closed'
+            return
+
+        existing = {
+            registration.user_id: registration
+            for registration in registration_model.objects.select_for_update().filter(
+                event_id=event_id, user_id__in=[request.user_id for request in requests]
+            )
+        }
+        free_seats = None
+        if event.max_attendees:
+            free_seats = max(event.max_attendees - event.confirmed_count, 0)
+
+        new, reactivated = [], []
+        confirmed = waitlisted = 0
+        for request in requests:
+            registration = existing.get(request.user_id)
+            if registration is not None and registration.status != 'cancelled':
+                request.status = 'duplicate'
+                continue
+
+            if free_seats is None or free_seats > 0:
+                request.status = 'confirmed'
+                confirmed += 1
+                if free_seats is not None:
+                    free_seats -= 1
+            else:
+                request.status = 'waitlist'
+                waitlisted += 1
+
+            if registration is None:
+                registration = registration_model(
+                    event_id=event_id, user_id=request.user_id, notes=request.notes,
+                )
+                new.append(registration)
+            else:
+                registration.notes = request.notes
+                registration.updated_at = now
+                reactivated.append(registration)
+            registration.status = request.status
+            existing[request.user_id] = registration
+
+        # Bulk writes skip the counter signals; counts are applied below
+        registration_model.objects.bulk_create(new)
+        registration_model.objects.bulk_update(reactivated, ['status', 'notes', 'updated_at'])
+        notifications().queue_registration_notices(event, new + reactivated)
+        if confirmed or waitlisted:
+            self.event_model.objects.filter(pk=event_id).update(
+                confirmed_count=F('confirmed_count') + confirmed,
+                waitlist_count=F('waitlist_count') + waitlisted,
+            )
+
+    def purge_processed(self, before):
+        """Delete processed requests older than `before`; returns the count."""
+        deleted, _ = self.exclude(status='pending').filter(processed_at__lt=before).delete()
+        return deleted
+
+
+class NotificationManager(models.Manager):
+    """
+    Writes the notification outbox. Call these inside the transaction that
+    changes the registrations, so a notice exists if and only if the change
+    was committed.
+    """
+
+    def queue_registration_notices(self, event, registrations, kind=None):
+        """
+        Queue a notice for each registration's status (or `kind`) and, for
+        confirmed ones, a reminder REMINDER_BEFORE the event starts.
+        """
+        now = timezone.now()
+        remind_at = event.start_date - REMINDER_BEFORE
+        notices = []
+        for registration in registrations:
+            notices.append(self.model(
+                event_id=event.pk, user_id=registration.user_id, kind=kind or registration.status,
+            ))
+            if registration.status == 'confirmed' and remind_at > now:
+                notices.append(self.model(
+                    event_id=event.pk, user_id=registration.user_id, kind='reminder', send_after=remind_at,
+                ))
+        self.bulk_create(notices)
+
+    def queue_cancellation(self, event_id, user_id):
+        """Drop the user's unsent notices for the event and queue a cancellation notice."""
+        self.filter(event_id=event_id, user_id=user_id, sent_at__isnull=True).delete()
+        self.create(event_id=event_id, user_id=user_id, kind='cancelled')
+
+    def due(self, now=None):
+        return self.filter(sent_at__isnull=True, send_after__lte=now or timezone.now())
@@ -1,7 +1,11 @@
 # events/models.py
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from .managers import NotificationManager, RegistrationManager, RegistrationRequestManager
 
 User = get_user_model()
 
@@ -11,6 +15,12 @@ class Event(models.Model):
         ('published', 'Published'),
         ('cancelled', 'Cancelled'),
     ]
+    RECURRENCE_CHOICES = [
+        ('', 'Does not repeat'),
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+    ]
     
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -21,24 +31,88 @@ class Event(models.Model):
                                                help_text="Leave blank for unlimited")
     registration_deadline = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
+    # A recurring event is the template of a series; its occurrences are
+    # expanded on the fly (events/recurrence.py) and only saved as child
+    # events, linked through `series`, once someone registers for one
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, blank=True, default='')
+    recurrence_interval = models.PositiveSmallIntegerField(
+        default=1, help_text="Repeat every N days/weeks/months"
+    )
+    recurrence_until = models.DateTimeField(null=True, blank=True,
+                                            help_text="Last possible occurrence; blank repeats forever")
+    series = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True,
+                               related_name='occurrences', editable=False)
+    use_registration_queue = models.BooleanField(
+        default=False,
+        help_text="Queue registrations and assign seats in the background "
+                  "(`manage.py process_registration_queue`); use for high-demand events",
+    )
+    # Denormalized registration counts, kept in step by events/signals.py and
+    # repaired by `manage.py reconcile_registration_counts`
+    confirmed_count = models.PositiveIntegerField(default=0, editable=False)
+    waitlist_count = models.PositiveIntegerField(default=0, editable=False)
+    # Weighted title/location/description document, maintained by a database
+    # trigger (see migration 0005) and queried by events/search.py
+    search_vector = SearchVectorField(null=True, editable=False)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_events')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['status', 'start_date'], name='event_status_start_idx'),
+            GinIndex(fields=['search_vector'], name='event_search_idx'),
+            # Series templates are few; window lookups scan only this index
+            models.Index(fields=['start_date'], condition=~models.Q(recurrence=''), name='event_series_idx'),
+        ]
+        constraints = [
+            # One saved occurrence per series and start; also the lookup
+            # index for materialized occurrences in a window
+            models.UniqueConstraint(fields=['series', 'start_date'], name='event_series_occurrence_unique'),
+        ]
 
     def __str__(self):
         return self.title
 
     @property
-    def is_registration_open(self):
-        """Check if registration is still open"""
-        if self.status != 'published':
+    def is_series(self):
+        return bool(self.recurrence)
+
+    @property
+    def is_virtual_occurrence(self):
+        """An expanded occurrence that hasn't been saved yet"""
+        return self.pk is None and self.series_id is not None
+
+    @property
+    def occurrence_key(self):
+        return int(self.start_date.timestamp())
+
+    def get_absolute_url(self):
+        if self.is_virtual_occurrence:
+            return reverse('events:occurrence', args=[self.series_id, self.occurrence_key])
+        return reverse('events:detail', args=[self.pk])
+
+    def get_register_url(self):
+        if self.is_virtual_occurrence:
+            return reverse('events:register_occurrence', args=[self.series_id, self.occurrence_key])
+        return reverse('events:register', args=[self.pk])
+
+    @property
+    def is_accepting_registrations(self):
+        """Published and before the deadline; full events still take waitlist entries"""
+        if self.status != 'published' or self.is_series:
             return False
         if self.registration_deadline and timezone.now() > self.registration_deadline:
             return False
-        if self.max_attendees and self.registrations.count() >= self.max_attendees:
+        return True
+
+    @property
+    def is_registration_open(self):
+        """Check if registration is still open with seats left"""
+        if not self.is_accepting_registrations:
+            return False
+        if self.max_attendees and self.confirmed_count >= self.max_attendees:
             return False
         return True
 
@@ -47,7 +121,7 @@ class Event(models.Model):
         """Return number of available spots, None if unlimited"""
         if not self.max_attendees:
             return None
-        return self.max_attendees - self.registrations.count()
+        return self.max_attendees - self.confirmed_count
 
     @property
     def is_past(self):
@@ -68,9 +142,105 @@ class Registration(models.Model):
     registered_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = RegistrationManager()
+
     class Meta:
         unique_together = ('event', 'user')
         ordering = ['-registered_at']
+        indexes = [
+            models.Index(fields=['event', 'status'], name='registration_event_status_idx'),
+            # MAX(updated_at) drives the events API ETag
+            models.Index(fields=['updated_at'], name='registration_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.event.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember what was loaded so the counter signals can tell which
+        # Event counts a status (or event) change affects
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_event_id = instance.__dict__.get('event_id')
+        return instance
+
+
+class RegistrationRequest(models.Model):
+    """
+    A queued registration for an event with use_registration_queue on. The
+    web request only inserts one of these; the queue worker turns pending
+    requests into registrations in arrival order and records the outcome.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('confirmed', 'Confirmed'),
+        ('waitlist', 'Waitlist'),
+        ('duplicate', 'Already registered'),
+        ('closed', 'Registration closed'),
+    ]
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='registration_requests')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='registration_requests')
+    notes = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = RegistrationRequestManager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Small partial index the worker scans for work
+            models.Index(fields=['id'], condition=models.Q(status='pending'), name='regrequest_pending_idx'),
+            # Status polling: latest request of a user for an event
+            models.Index(fields=['event', 'user'], name='regrequest_event_user_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'user'], condition=models.Q(status='pending'),
+                name='regrequest_one_pending',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.event_id} ({self.status})"
+
+
+class Notification(models.Model):
+    """
+    Outbox of emails to attendees. Rows are written in the same transaction
+    as the registration change they announce and sent later, in batches, by
+    `manage.py dispatch_notifications`, so no SMTP round trip happens while
+    a web request holds the event row.
+    """
+    KIND_CHOICES = [
+        ('confirmed', 'Registration confirmed'),
+        ('waitlist', 'Added to waitlist'),
+        ('promoted', 'Promoted from waitlist'),
+        ('cancelled', 'Registration cancelled'),
+        ('reminder', 'Event reminder'),
+    ]
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='notifications')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    send_after = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = NotificationManager()
+
+    class Meta:
+        ordering = ['send_after', 'id']
+        indexes = [
+            # The dispatcher only ever scans unsent rows that are due
+            models.Index(fields=['send_after', 'id'], condition=models.Q(sent_at__isnull=True),
+                         name='notification_due_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.event.title}"
\ No newline at end of file
+        return f"{self.get_kind_display()} - {self.user_id} - {self.event_id}"
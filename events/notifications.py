@@ -0,0 +1,130 @@
+# events/notifications.py
+"""
+Sending the notification outbox (see Notification and NotificationManager).
+
+Due notifications are claimed in batches with SKIP LOCKED, so several
+dispatchers can run at once, and each batch goes out after the claim has
+committed, over a single email connection instead of one SMTP handshake per
+message. Failed sends are
+retried with a growing delay, up to MAX_ATTEMPTS.
+"""
+import datetime
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .managers import REMINDER_BEFORE
+from .models import Notification
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = datetime.timedelta(minutes=5)
+# How long a claimed batch stays reserved for the dispatcher sending it
+CLAIM_TIMEOUT = datetime.timedelta(minutes=10)
+
+SUBJECTS = {
+    'confirmed': 'You are registered for {title}',
+    'waitlist': 'You are on the waitlist for {title}',
+    'promoted': 'A spot opened up: you are registered for {title}',
+    'cancelled': 'Your registration for {title} was cancelled',
+    'reminder': 'Reminder: {title} starts soon',
+}
+
+
+def skip_reason(notification, now):
+    """Why a due notification should not be sent (anymore), or None."""
+    event = notification.event
+    if not notification.user.email:
+        return 'User has no email address'
+    if notification.kind == 'reminder':
+        if event.status != 'published':
+            return 'Event is no longer published'
+        if event.start_date <= now:
+            return 'Event already started'
+    return None
+
+
+def build_message(notification, site_name, base_url):
+    event = notification.event
+    context = {
+        'notification': notification,
+        'event': event,
+        'user': notification.user,
+        'site_name': site_name,
+        'event_url': base_url + reverse('events:detail', urlconf=settings.TENANT_URLCONF, args=[event.pk]),
+    }
+    return EmailMessage(
+        subject=f'[{site_name}] ' + SUBJECTS[notification.kind].format(title=event.title),
+        body=render_to_string('events/email/notification.txt', context),
+        to=[notification.user.email],
+    )
+
+
+def claim_due(batch_size, now):
+    """
+    Lock a batch of due notifications with SKIP LOCKED and lease them to this
+    dispatcher by moving send_after past CLAIM_TIMEOUT, then commit, so no
+    row lock is held while talking to the mail server. A dispatcher that dies
+    mid-batch leaves its rows to be picked up again once the lease runs out.
+
+    Reminders whose event moved and notifications that should no longer go
+    out are settled here. Returns (to_send, rescheduled, skipped).
+    """
+    to_send, rescheduled, skipped = [], 0, 0
+    with transaction.atomic():
+        batch = list(
+            Notification.objects.due(now)
+            .filter(attempts__lt=MAX_ATTEMPTS)
+            .select_related('event', 'user')
+            .select_for_update(skip_locked=True, of=('self',))
+            .order_by('send_after', 'id')[:batch_size]
+        )
+        for notification in batch:
+            if notification.kind == 'reminder':
+                # The event may have moved since the reminder was queued
+                remind_at = notification.event.start_date - REMINDER_BEFORE
+                if remind_at > now:
+                    notification.send_after = remind_at
+                    rescheduled += 1
+                    continue
+
+            reason = skip_reason(notification, now)
+            if reason:
+                notification.sent_at, notification.last_error = now, reason
+                skipped += 1
+                continue
+
+            notification.send_after = now + CLAIM_TIMEOUT
+            to_send.append(notification)
+
+        Notification.objects.bulk_update(batch, ['send_after', 'sent_at', 'last_error'])
+    return to_send, rescheduled, skipped
+
+
+def dispatch_due(batch_size=100, site_name='', base_url=''):
+    """
+    Send one batch of due notifications in the current schema. Returns
+    (sent, failed, skipped, rescheduled); all zero once nothing is due.
+    """
+    now = timezone.now()
+    batch, rescheduled, skipped = claim_due(batch_size, now)
+    sent = failed = 0
+    if batch:
+        with get_connection() as connection:
+            for notification in batch:
+                try:
+                    connection.send_messages([build_message(notification, site_name, base_url)])
+                except Exception as e:
+                    notification.attempts += 1
+                    notification.last_error = str(e)
+                    notification.send_after = now + RETRY_DELAY * 2 ** notification.attempts
+                    failed += 1
+                else:
+                    notification.sent_at = timezone.now()
+                    sent += 1
+
+        Notification.objects.bulk_update(batch, ['send_after', 'sent_at', 'attempts', 'last_error'])
+    return sent, failed, skipped, rescheduled
@@ -0,0 +1,207 @@
+# events/pagination.py
+"""
+Keyset (cursor) pagination over events ordered by (start_date, id).
+
+Each page is fetched with a `WHERE (start_date, id) > (...)` style filter
+served by the (status, start_date) index, so deep pages cost the same as the
+first one. Cursors are opaque URL-safe strings that encode the direction and
+the (start_date, id) of the row the page starts after/before.
+"""
+import base64
+import datetime
+import json
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+PAGE_SIZE = getattr(settings, 'EVENTS_PAGE_SIZE', 20)
+MAX_PAGE_SIZE = getattr(settings, 'EVENTS_MAX_PAGE_SIZE', 100)
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+# Turns an exclusive lower bound on start_date into an inclusive one
+EPSILON = datetime.timedelta(microseconds=1)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(direction, start_date, pk):
+    payload = json.dumps({'d': direction, 's': start_date.isoformat(), 'i': pk})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (direction, start_date, pk) or raise InvalidCursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction, start_date, pk = payload['d'], parse_datetime(payload['s']), int(payload['i'])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if direction not in (NEXT, PREVIOUS) or start_date is None:
+        raise InvalidCursor('Invalid cursor')
+    return direction, start_date, pk
+
+
+def page_size_from_request(request):
+    """?page_size=, clamped to EVENTS_MAX_PAGE_SIZE; falls back to EVENTS_PAGE_SIZE."""
+    try:
+        size = int(request.GET.get('page_size', PAGE_SIZE))
+    except ValueError:
+        return PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def page_url(request, cursor):
+    """Absolute URL of the current view with ?cursor= replaced."""
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    return request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+
+
+def row_position(row):
+    """
+    (start_date, id) of a model instance or a values() dict. An unsaved
+    occurrence of a recurring event has no id and takes -series_id instead,
+    so it sorts just before saved events with the same start and can be a
+    cursor position itself.
+    """
+    if isinstance(row, dict):
+        start_date, pk, series_id = row['start_date'], row['id'], row.get('series')
+    else:
+        start_date, pk, series_id = row.start_date, row.pk, row.series_id
+    return start_date, pk if pk is not None else -series_id
+
+
+@dataclass
+class KeysetPage:
+    items: list = field(default_factory=list)
+    next_cursor: str = None
+    previous_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Paginate an Event queryset by (start_date, id).
+
+    Without a cursor the first page starts at `start` (a datetime, e.g. now)
+    or at the very first event. Use paginate() from sync code and
+    apaginate() from async views.
+
+    `occurrences(lower, upper)`, if given, returns rows that are computed
+    rather than queried (recurring event occurrences) with lower < start <=
+    upper, either bound None for open. They are merged into the pages by
+    row_position() and count against page_size like queried rows.
+    """
+
+    def __init__(self, queryset, page_size=PAGE_SIZE, cursor=None, start=None, occurrences=None):
+        self.page_size = page_size
+        self.queryset = queryset.order_by('start_date', 'id')
+        self.start = start
+        self.occurrences = occurrences
+        self.before_anchor = None
+
+        self.cursor_position = None
+        if cursor:
+            self.direction, start_date, pk = decode_cursor(cursor)
+            self.cursor_position = (start_date, pk)
+            if self.direction == NEXT:
+                self.query = self.queryset.filter(
+                    Q(start_date__gt=start_date) | Q(start_date=start_date, id__gt=pk)
+                )
+            else:
+                self.query = self.queryset.filter(
+                    Q(start_date__lt=start_date) | Q(start_date=start_date, id__lt=pk)
+                ).order_by('-start_date', '-id')
+        else:
+            self.direction = NEXT
+            self.query = self.queryset
+            if start is not None:
+                self.query = self.queryset.filter(start_date__gte=start)
+                self.before_anchor = self.queryset.filter(start_date__lt=start).values_list('id')
+
+        self.query = self.query[:page_size + 1]
+        self.came_from_cursor = bool(cursor)
+
+    def _computed_rows(self, rows):
+        """
+        Computed rows that can land on this page: those between the cursor
+        (or start) and the last queried row, which bounds the page when
+        there are more queried rows than fit.
+        """
+        if self.occurrences is None:
+            return []
+        full = len(rows) > self.page_size
+        if self.direction == NEXT:
+            after = self.cursor_position or (self.start and (self.start, float('-inf')))
+            lower = after[0] - EPSILON if after else None
+            upper = row_position(rows[-1])[0] if full else None
+            return [row for row in self.occurrences(lower, upper)
+                    if after is None or row_position(row) > after]
+        lower = row_position(rows[-1])[0] if full else None
+        return [row for row in self.occurrences(lower, self.cursor_position[0])
+                if row_position(row) < self.cursor_position]
+
+    def _has_computed_before_start(self):
+        return bool(self.occurrences and self.start is not None
+                    and self.occurrences(None, self.start - EPSILON))
+
+    def _build_page(self, rows, computed, anything_before_start):
+        """`anything_before_start`: the first page has rows before `start`."""
+        if self.direction == NEXT:
+            merged = sorted([*rows, *computed], key=row_position)
+            items = merged[:self.page_size]
+            has_next = len(merged) > self.page_size
+            has_previous = self.came_from_cursor or anything_before_start
+        else:
+            merged = sorted([*rows, *computed], key=row_position, reverse=True)
+            items = merged[:self.page_size]
+            items.reverse()
+            has_next, has_previous = True, len(merged) > self.page_size
+
+        if not items:
+            # Nothing at or after the anchor: still let the user page back
+            if has_previous and self.direction == NEXT:
+                position = self.cursor_position or (self.start, 0)
+                return KeysetPage(previous_cursor=encode_cursor(PREVIOUS, *position))
+            return KeysetPage()
+
+        return KeysetPage(
+            items=items,
+            next_cursor=encode_cursor(NEXT, *row_position(items[-1])) if has_next else None,
+            previous_cursor=encode_cursor(PREVIOUS, *row_position(items[0])) if has_previous else None,
+        )
+
+    def paginate(self):
+        rows = list(self.query)
+        anything_before_start = (
+            self.before_anchor is not None
+            and (self.before_anchor.exists() or self._has_computed_before_start())
+        )
+        return self._build_page(rows, self._computed_rows(rows), anything_before_start)
+
+    async def apaginate(self):
+        rows = [row async for row in self.query]
+        anything_before_start = (
+            self.before_anchor is not None
+            and (await self.before_anchor.aexists()
+                 or await sync_to_async(self._has_computed_before_start)())
+        )
+        computed = await sync_to_async(self._computed_rows)(rows)
+        return self._build_page(rows, computed, anything_before_start)
@@ -0,0 +1,178 @@
+# events/recurrence.py
+"""
+Lazy expansion of recurring events.
+
+A recurring Event is the template of a series. Its occurrences are computed
+for the date window a page actually shows instead of being stored; an
+occurrence becomes a real Event row (with `series` set) only when someone
+registers for it, so registrations, capacity and counters work per
+occurrence exactly as for one-off events.
+
+Window queries stay cheap as series grow: series templates are found
+through the small partial index event_series_idx, and saved occurrences
+through the (series, start_date) unique constraint's index.
+"""
+import calendar
+import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Event
+from .pagination import row_position
+
+# An open-ended window is expanded this far into the past or the future
+HORIZON = datetime.timedelta(days=getattr(settings, 'EVENTS_RECURRENCE_HORIZON_DAYS', 90))
+
+STEP_DAYS = {'daily': 1, 'weekly': 7}
+
+# Copied from the series template onto each occurrence
+OCCURRENCE_FIELDS = (
+    'title', 'description', 'location', 'max_attendees', 'status',
+    'use_registration_queue', 'created_by_id',
+)
+
+
+def _add_months(value, months):
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def occurrence_starts(series, lower, upper):
+    """
+    Yield the start of each occurrence of `series` with lower < start <= upper.
+    Steps are taken in local time so occurrences keep their wall-clock time
+    across DST changes.
+    """
+    tz = timezone.get_current_timezone()
+    first = timezone.localtime(series.start_date, tz).replace(tzinfo=None)
+    interval = series.recurrence_interval or 1
+    lower_local = timezone.localtime(lower, tz).replace(tzinfo=None)
+
+    if series.recurrence in STEP_DAYS:
+        step = datetime.timedelta(days=STEP_DAYS[series.recurrence] * interval)
+        nth = lambda k: first + k * step  # noqa: E731
+        k = max(0, (lower_local - first) // step)
+    else:
+        # Always count from the first occurrence so a 31st doesn't drift to the 28th
+        nth = lambda k: _add_months(first, k * interval)  # noqa: E731
+        months = (lower_local.year - first.year) * 12 + lower_local.month - first.month
+        k = max(0, months // interval - 1)
+
+    while True:
+        start = timezone.make_aware(nth(k), tz)
+        if start > upper or (series.recurrence_until and start > series.recurrence_until):
+            return
+        if start > lower:
+            yield start
+        k += 1
+
+
+def find_occurrence(series, key):
+    """Start of the occurrence with the given occurrence_key (a Unix timestamp), or None."""
+    approx = datetime.datetime.fromtimestamp(key, tz=datetime.timezone.utc)
+    for start in occurrence_starts(series, approx - datetime.timedelta(seconds=1),
+                                   approx + datetime.timedelta(seconds=1)):
+        if int(start.timestamp()) == key:
+            return start
+    return None
+
+
+def clamp_window(lower, upper, now=None):
+    """
+    Close the open (None) ends of a (lower, upper] window at HORIZON around
+    now. Explicit bounds are kept, so a window the caller asked for never
+    loses occurrences just for lying outside the horizon.
+    """
+    now = now or timezone.now()
+    lower = now - HORIZON if lower is None else lower
+    upper = now + HORIZON if upper is None else upper
+    return lower, upper
+
+
+def series_in_window(events, lower, upper):
+    """Series templates among `events` that can have occurrences in (lower, upper]."""
+    return (
+        events.exclude(recurrence='')
+        .filter(start_date__lte=upper)
+        .filter(Q(recurrence_until__isnull=True) | Q(recurrence_until__gt=lower))
+        .defer('search_vector')
+    )
+
+
+def build_occurrence(series, start):
+    """Unsaved Event for one occurrence of series."""
+    offset = start - series.start_date
+    return Event(
+        series=series,
+        start_date=start,
+        end_date=series.end_date + offset,
+        registration_deadline=series.registration_deadline and series.registration_deadline + offset,
+        **{name: getattr(series, name) for name in OCCURRENCE_FIELDS},
+    )
+
+
+def virtual_occurrences(events, lower, upper):
+    """
+    Unsaved occurrences of the series among `events` in (lower, upper], with
+    open ends closed by clamp_window(). Occurrences that were already saved
+    are left out: they are ordinary events and show up in the regular event
+    query (or are hidden, if that occurrence was cancelled).
+    """
+    lower, upper = clamp_window(lower, upper)
+    if lower >= upper:
+        return []
+    return expand_series(list(series_in_window(events, lower, upper)), lower, upper)
+
+
+def expand_series(series_list, lower, upper):
+    """Unsaved occurrences of the given series in (lower, upper]."""
+    if not series_list:
+        return []
+    saved = set(
+        Event.objects.filter(series__in=series_list, start_date__gt=lower, start_date__lte=upper)
+        .values_list('series_id', 'start_date')
+    )
+    return [
+        build_occurrence(series, start)
+        for series in series_list
+        for start in occurrence_starts(series, lower, upper)
+        if (series.pk, start) not in saved
+    ]
+
+
+def upcoming_occurrences(series, limit=10):
+    """The next `limit` published occurrences of a series, saved or not."""
+    lower, upper = clamp_window(timezone.now(), None)
+    saved = series.occurrences.filter(
+        status='published', start_date__gt=lower, start_date__lte=upper,
+    ).defer('search_vector')
+    return merge_occurrences(saved, expand_series([series], lower, upper))[:limit]
+
+
+def merge_occurrences(items, occurrences):
+    """
+    Merge occurrences into saved events (instances or values() dicts) in
+    (start_date, id) order; an occurrence sorts before a saved event with the
+    same start, as in KeysetPaginator pages.
+    """
+    return sorted([*items, *occurrences], key=row_position)
+
+
+def materialize_occurrence(series, start):
+    """Return the saved Event for an occurrence, creating it on first use."""
+    occurrence = build_occurrence(series, start)
+    event, _ = Event.objects.get_or_create(
+        series=series,
+        start_date=start,
+        defaults={
+            'end_date': occurrence.end_date,
+            'registration_deadline': occurrence.registration_deadline,
+            **{name: getattr(occurrence, name) for name in OCCURRENCE_FIELDS},
+        },
+    )
+    return event
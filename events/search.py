@@ -0,0 +1,85 @@
+# events/search.py
+"""
+Full-text event search.
+
+Queries go against Event.search_vector, a weighted tsvector kept up to date
+by a trigger (migration 0005) and covered by the event_search_idx GIN index,
+so matching never scans the table. Status/date filters are plain btree
+conditions that Postgres combines with the GIN lookup.
+"""
+import datetime
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Event
+
+SEARCH_CONFIG = 'english'
+SEARCH_LIMIT = getattr(settings, 'EVENTS_SEARCH_LIMIT', 50)
+STATUSES = {value for value, _ in Event.STATUS_CHOICES}
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def _day_start(value):
+    return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+
+def date_range(params):
+    """
+    (start, end) datetimes for ?from= and ?to= (ISO dates, inclusive); either
+    may be None. Raises InvalidFilter on bad values.
+    """
+    bounds = []
+    for param, offset in (('from', 0), ('to', 1)):
+        value = params.get(param)
+        if not value:
+            bounds.append(None)
+            continue
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise InvalidFilter(f'Invalid date for "{param}": {value}')
+        bounds.append(_day_start(day + datetime.timedelta(days=offset)))
+    return tuple(bounds)
+
+
+def filter_events(events, params):
+    """
+    Apply ?status=, ?from= and ?to= to an Event queryset or values()
+    queryset. Raises InvalidFilter on bad values.
+    """
+    status = params.get('status')
+    if status:
+        if status not in STATUSES:
+            raise InvalidFilter(f'Unknown status "{status}"')
+        events = events.filter(status=status)
+
+    # Range on the timestamp rather than start_date__date, so the
+    # (status, start_date) index still applies
+    start, end = date_range(params)
+    if start is not None:
+        events = events.filter(start_date__gte=start)
+    if end is not None:
+        events = events.filter(start_date__lt=end)
+    return events
+
+
+def search_events(events, query, limit=SEARCH_LIMIT):
+    """
+    Events matching `query` (websearch syntax: quoted phrases, OR, -word),
+    best match first, at most `limit` of them.
+    """
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        events.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F('search_vector'), search_query))
+        .order_by('-rank', 'start_date', 'id')[:limit]
+    )
@@ -0,0 +1,48 @@
+# events/signals.py
+from functools import partial
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eventsaas.cache import bump_tenant_version
+from .counters import adjust_registration_counts
+from .models import Event, Registration
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Registration)
+@receiver(post_delete, sender=Registration)
+def tenant_content_changed(sender, **kwargs):
+    """
+    Invalidate everything cached under the current tenant's content version.
+    Deferred to commit: bumping earlier would let a concurrent request cache
+    the old rows under the new version.
+    """
+    transaction.on_commit(partial(bump_tenant_version, connection.schema_name))
+
+
+@receiver(post_save, sender=Registration)
+def registration_saved(sender, instance, created, **kwargs):
+    """
+    Move the registration between Event counters when it is created or
+    changes, unless RegistrationManager already adjusted them.
+    """
+    old_status = None if created else getattr(instance, '_loaded_status', None)
+    old_event_id = None if created else getattr(instance, '_loaded_event_id', None)
+
+    already_counted = getattr(instance, '_skip_counter_update', False)
+    if not already_counted and (old_status, old_event_id) != (instance.status, instance.event_id):
+        if old_event_id is not None:
+            adjust_registration_counts(old_event_id, old_status, -1)
+        adjust_registration_counts(instance.event_id, instance.status, 1)
+
+    instance._loaded_status = instance.status
+    instance._loaded_event_id = instance.event_id
+
+
+@receiver(post_delete, sender=Registration)
+def registration_deleted(sender, instance, **kwargs):
+    status = getattr(instance, '_loaded_status', instance.status)
+    adjust_registration_counts(instance.event_id, status, -1)
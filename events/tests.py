@@ -1,3 +1,222 @@
-from django.test import TestCase
+import datetime
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+
+from .models import Event, Registration
+from .pagination import InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor, row_position
+from .recurrence import HORIZON, clamp_window, find_occurrence, occurrence_starts, virtual_occurrences
+
+User = get_user_model()
+UTC = datetime.timezone.utc
+
+
+def utc(*args):
+    return datetime.datetime(*args, tzinfo=UTC)
+
+
+def series(start, recurrence, interval=1, until=None):
+    return Event(
+        pk=1, title='Series', start_date=start, end_date=start + datetime.timedelta(hours=1),
+        recurrence=recurrence, recurrence_interval=interval, recurrence_until=until,
+    )
+
+
+class EventsTenantTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Events Test Tenant'
+
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer')
+
+    def make_event(self, start, **kwargs):
+        kwargs.setdefault('status', 'published')
+        return Event.objects.create(
+            title=kwargs.pop('title', 'Event'), description='', start_date=start,
+            end_date=start + datetime.timedelta(hours=1), created_by=self.organizer, **kwargs
+        )
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        start = utc(2030, 1, 1, 12)
+        for pk in (42, -7):
+            self.assertEqual(decode_cursor(encode_cursor('n', start, pk)), ('n', start, pk))
+
+    def test_invalid_cursors(self):
+        for cursor in ('', 'garbage', encode_cursor('x', utc(2030, 1, 1), 1)):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_occurrence_sorts_before_saved_event_with_same_start(self):
+        start = utc(2030, 1, 1, 12)
+        occurrence = {'id': None, 'series': 5, 'start_date': start}
+        saved = {'id': 1, 'series': None, 'start_date': start}
+        self.assertEqual(row_position(occurrence), (start, -5))
+        self.assertLess(row_position(occurrence), row_position(saved))
+
+
+class OccurrenceStartsTests(SimpleTestCase):
+    def test_window_is_exclusive_below_and_inclusive_above(self):
+        event = series(utc(2030, 1, 1, 9), 'daily')
+        starts = list(occurrence_starts(event, utc(2030, 1, 2, 9), utc(2030, 1, 4, 9)))
+        self.assertEqual(starts, [utc(2030, 1, 3, 9), utc(2030, 1, 4, 9)])
+
+    def test_interval_and_until(self):
+        event = series(utc(2030, 1, 1, 9), 'weekly', interval=2, until=utc(2030, 2, 1))
+        starts = list(occurrence_starts(event, utc(2029, 12, 1), utc(2030, 6, 1)))
+        self.assertEqual(starts, [utc(2030, 1, 1, 9), utc(2030, 1, 15, 9), utc(2030, 1, 29, 9)])
+
+    def test_monthly_keeps_day_of_month(self):
+        event = series(utc(2030, 1, 31, 9), 'monthly')
+        starts = list(occurrence_starts(event, utc(2030, 2, 1), utc(2030, 4, 30, 9)))
+        self.assertEqual(starts, [utc(2030, 2, 28, 9), utc(2030, 3, 31, 9), utc(2030, 4, 30, 9)])
+
+    def test_keeps_wall_clock_time_across_dst(self):
+        berlin = ZoneInfo('Europe/Berlin')
+        event = series(datetime.datetime(2030, 3, 20, 10, tzinfo=berlin), 'weekly')
+        with timezone.override(berlin):
+            starts = list(occurrence_starts(event, utc(2030, 3, 1), utc(2030, 4, 5)))
+        self.assertEqual([start.astimezone(berlin).hour for start in starts], [10, 10, 10])
+        # Clocks go forward on March 31st
+        in_utc = [start.astimezone(UTC) for start in starts]
+        self.assertEqual(in_utc[2] - in_utc[1], datetime.timedelta(days=7, hours=-1))
+
+    def test_find_occurrence(self):
+        event = series(utc(2030, 1, 1, 9), 'daily')
+        start = utc(2030, 1, 5, 9)
+        self.assertEqual(find_occurrence(event, int(start.timestamp())), start)
+        self.assertIsNone(find_occurrence(event, int(start.timestamp()) + 60))
+
+
+class ClampWindowTests(SimpleTestCase):
+    now = utc(2030, 1, 1)
+
+    def test_open_ends_are_closed_at_the_horizon(self):
+        self.assertEqual(clamp_window(None, None, self.now), (self.now - HORIZON, self.now + HORIZON))
+
+    def test_explicit_bounds_outside_the_horizon_are_kept(self):
+        lower, upper = self.now + 2 * HORIZON, self.now + 3 * HORIZON
+        self.assertEqual(clamp_window(lower, upper, self.now), (lower, upper))
+
+
+class RegistrationCounterTests(EventsTenantTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.make_event(timezone.now() + datetime.timedelta(days=7), max_attendees=1)
+        self.alice, self.bob, self.carol = (
+            User.objects.create_user(name) for name in ('alice', 'bob', 'carol')
+        )
+
+    def assertCounts(self, confirmed, waitlist):
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.confirmed_count, self.event.waitlist_count), (confirmed, waitlist))
+
+    def test_register_confirms_until_full_then_waitlists(self):
+        first, created = Registration.objects.register(self.event, self.alice)
+        second, _ = Registration.objects.register(self.event, self.bob)
+        self.assertTrue(created)
+        self.assertEqual((first.status, second.status), ('confirmed', 'waitlist'))
+        self.assertCounts(1, 1)
+
+        again, created = Registration.objects.register(self.event, self.alice)
+        self.assertFalse(created)
+        self.assertEqual(again.pk, first.pk)
+        self.assertCounts(1, 1)
+
+    def test_cancel_promotes_oldest_waitlisted(self):
+        confirmed, _ = Registration.objects.register(self.event, self.alice)
+        oldest, _ = Registration.objects.register(self.event, self.bob)
+        Registration.objects.register(self.event, self.carol)
+
+        promoted = Registration.objects.cancel(confirmed)
+
+        self.assertEqual(promoted.pk, oldest.pk)
+        self.assertEqual(Registration.objects.get(pk=oldest.pk).status, 'confirmed')
+        self.assertCounts(1, 1)
+
+    def test_cancelling_twice_releases_one_seat(self):
+        confirmed, _ = Registration.objects.register(self.event, self.alice)
+        Registration.objects.register(self.event, self.bob)
+        Registration.objects.register(self.event, self.carol)
+        stale = Registration.objects.get(pk=confirmed.pk)
+
+        Registration.objects.cancel(confirmed)
+        self.assertIsNone(Registration.objects.cancel(stale))
+
+        self.assertCounts(1, 1)
+        self.assertEqual(Registration.objects.filter(event=self.event, status='confirmed').count(), 1)
+
+    def test_cancel_uses_current_status(self):
+        confirmed, _ = Registration.objects.register(self.event, self.alice)
+        waitlisted, _ = Registration.objects.register(self.event, self.bob)
+        Registration.objects.register(self.event, self.carol)
+        Registration.objects.cancel(confirmed)  # promotes bob
+
+        # bob's instance still says 'waitlist'
+        promoted = Registration.objects.cancel(waitlisted)
+
+        self.assertEqual(promoted.user, self.carol)
+        self.assertCounts(1, 0)
+
+
+class KeysetPaginatorTests(EventsTenantTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now().replace(microsecond=0)
+        self.past = self.make_event(self.now - datetime.timedelta(days=1))
+        self.upcoming = [self.make_event(self.now + datetime.timedelta(hours=hours)) for hours in (1, 2, 2, 5, 9)]
+
+    def paginate(self, cursor=None, page_size=2, occurrences=None):
+        return KeysetPaginator(
+            Event.objects.filter(status='published', recurrence=''), page_size=page_size,
+            cursor=cursor, start=self.now, occurrences=occurrences,
+        ).paginate()
+
+    def walk(self, **kwargs):
+        """Positions on every page from the first one forward, and the last page."""
+        page = self.paginate(**kwargs)
+        positions = []
+        while True:
+            self.assertLessEqual(len(page.items), kwargs.get('page_size', 2))
+            positions += [row_position(row) for row in page.items]
+            if not page.has_next:
+                return positions, page
+            page = self.paginate(cursor=page.next_cursor, **kwargs)
+
+    def test_pages_forward_from_start(self):
+        positions, _ = self.walk()
+        self.assertEqual(positions, [row_position(event) for event in self.upcoming])
+
+    def test_first_page_links_back_to_past_events(self):
+        first = self.paginate()
+        self.assertTrue(first.has_previous)
+        previous = self.paginate(cursor=first.previous_cursor)
+        self.assertEqual(previous.items, [self.past])
+        self.assertFalse(previous.has_previous)
+        self.assertEqual(self.paginate(cursor=previous.next_cursor).items, first.items)
+
+    def test_pages_backward(self):
+        _, page = self.walk()
+        positions = [row_position(row) for row in page.items]
+        while page.has_previous:
+            page = self.paginate(cursor=page.previous_cursor)
+            positions = [row_position(row) for row in page.items] + positions
+        self.assertEqual(positions, [row_position(event) for event in [self.past, *self.upcoming]])
+
+    def test_occurrences_count_against_page_size(self):
+        self.make_event(self.now + datetime.timedelta(hours=2), recurrence='daily',
+                        recurrence_until=self.now + datetime.timedelta(days=3, hours=3))
+        published = Event.objects.filter(status='published')
+
+        def occurrences(lower, upper):
+            return virtual_occurrences(published, lower, upper)
+
+        positions, _ = self.walk(occurrences=occurrences, page_size=3)
+        self.assertEqual(len(positions), len(self.upcoming) + 4)
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(len(set(positions)), len(positions))
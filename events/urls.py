@@ -6,8 +6,16 @@ app_name = 'events'
 
 urlpatterns = [
     path('', views.event_list, name='list'),
+    path('search/', views.event_search, name='search'),
     path('event/<int:pk>/', views.event_detail, name='detail'),
     path('event/<int:pk>/register/', views.register_for_event, name='register'),
+    path('event/<int:pk>/occurrences/<int:key>/', views.event_occurrence, name='occurrence'),
+    path('event/<int:pk>/occurrences/<int:key>/register/', views.register_for_occurrence, name='register_occurrence'),
+    path('event/<int:pk>/register/status/', views.registration_status, name='registration_status'),
     path('event/<int:pk>/cancel/', views.cancel_registration, name='cancel'),
+    path('event/<int:pk>/registrations/export/', views.export_registrations, name='export_event_registrations'),
+    path('registrations/export/', views.export_registrations, name='export_registrations'),
     path('my-registrations/', views.my_registrations, name='my_registrations'),
+    path('calendar.ics', views.events_ical, name='ical'),
+    path('my-registrations/<str:token>/calendar.ics', views.my_registrations_ical, name='my_registrations_ical'),
 ]
\ No newline at end of file
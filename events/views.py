@@ -1,65 +1,196 @@
 # events/views.py
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Subquery
+from django.http import Http404, JsonResponse
+from django_tenants.utils import get_tenant
 from django.utils import timezone
-from django.db import IntegrityError
-from .models import Event, Registration
+from django.utils.functional import SimpleLazyObject
+from .exports import EXPORT_FORMATS, export_response
+from .ical import (
+    events_calendar, feed_response, make_feed_token, registrations_calendar, user_id_from_token,
+)
+from .models import Event, Registration, RegistrationRequest
+from .pagination import InvalidCursor, KeysetPaginator, page_size_from_request, page_url
+from .recurrence import (
+    build_occurrence, find_occurrence, materialize_occurrence, upcoming_occurrences,
+    virtual_occurrences,
+)
+from .search import InvalidFilter, filter_events, search_events
+
+def split_events(events, now):
+    """Split one page of events into (upcoming, past) in a single pass"""
+    upcoming_events, past_events = [], []
+    for event in events:
+        if event.start_date >= now:
+            upcoming_events.append(event)
+        else:
+            past_events.append(event)
+    return upcoming_events, past_events
 
 def event_list(request):
-    """Display list of published events"""
-    events = Event.objects.filter(status='published').order_by('start_date')
-    upcoming_events = events.filter(start_date__gte=timezone.now())
-    past_events = events.filter(start_date__lt=timezone.now())
+    """Display list of published events, one keyset page at a time"""
+    # The first page starts at the next upcoming event; earlier pages go back
+    # into past events
+    now = timezone.now()
+    published = Event.objects.filter(status='published')
+    try:
+        # Series templates aren't listed themselves; their occurrences are
+        # paged along with the one-off events
+        paginator = KeysetPaginator(
+            published.filter(recurrence='').defer('search_vector'),
+            page_size=page_size_from_request(request),
+            cursor=request.GET.get('cursor'),
+            start=now,
+            occurrences=lambda lower, upper: virtual_occurrences(published, lower, upper),
+        )
+    except InvalidCursor:
+        raise Http404("Invalid page")
+    # Evaluated on first use only: when the template's cached fragment is
+    # fresh, rendering the page runs no event query at all
+    page = SimpleLazyObject(paginator.paginate)
+    split = SimpleLazyObject(lambda: split_events(page.items, now))
     
     context = {
-        'upcoming_events': upcoming_events,
-        'past_events': past_events,
+        'upcoming_events': SimpleLazyObject(lambda: split[0]),
+        'past_events': SimpleLazyObject(lambda: split[1]),
+        'page': page,
+        'next_url': SimpleLazyObject(lambda: page_url(request, page.next_cursor) or ''),
+        'previous_url': SimpleLazyObject(lambda: page_url(request, page.previous_cursor) or ''),
+        # The pager links are absolute, so the cached fragment is per host
+        'page_key': f'{request.get_host()}?{request.GET.urlencode()}',
     }
     return render(request, 'events/event_list.html', context)
 
+def event_search(request):
+    """Ranked full-text search over events, with status/date filters"""
+    query = request.GET.get('q', '').strip()
+    # Staff can search drafts and cancelled events too
+    events = Event.objects.all() if request.user.is_staff else Event.objects.filter(status='published')
+    try:
+        events = filter_events(events, request.GET)
+    except InvalidFilter as e:
+        messages.error(request, str(e))
+        events = Event.objects.none()
+
+    context = {
+        'query': query,
+        'results': list(search_events(events, query)) if query else [],
+        'status': request.GET.get('status', ''),
+        'date_from': request.GET.get('from', ''),
+        'date_to': request.GET.get('to', ''),
+        'statuses': Event.STATUS_CHOICES,
+    }
+    return render(request, 'events/event_search.html', context)
+
 def event_detail(request, pk):
     """Display event details"""
-    event = get_object_or_404(Event, pk=pk, status='published')
-    user_registered = False
-    user_registration = None
-    
+    # Counts are columns on Event and the user's registration status comes
+    # from a correlated subquery, so the whole page is one query
+    events = Event.objects.filter(status='published').defer('search_vector')
     if request.user.is_authenticated:
-        try:
-            user_registration = Registration.objects.get(event=event, user=request.user)
-            user_registered = True
-        except Registration.DoesNotExist:
-            pass
+        events = events.annotate(
+            user_registration_status=Subquery(
+                Registration.objects.filter(event=OuterRef('pk'), user=request.user).values('status')[:1]
+            ),
+            user_request_pending=Exists(
+                RegistrationRequest.objects.filter(event=OuterRef('pk'), user=request.user, status='pending')
+            ),
+        )
+    event = get_object_or_404(events, pk=pk)
+    registration_status = getattr(event, 'user_registration_status', None)
     
     context = {
         'event': event,
-        'user_registered': user_registered,
-        'user_registration': user_registration,
+        # Cancelled rows are reactivated by register(), so they don't count
+        'user_registered': registration_status in ('confirmed', 'waitlist'),
+        'registration_status': registration_status,
+        'request_pending': getattr(event, 'user_request_pending', False),
+        'occurrences': upcoming_occurrences(event) if event.is_series else None,
+    }
+    return render(request, 'events/event_detail.html', context)
+
+def get_occurrence_start(series_pk, key):
+    """(series, start) for an occurrence URL, or 404"""
+    series = get_object_or_404(
+        Event.objects.filter(status='published').exclude(recurrence='').defer('search_vector'),
+        pk=series_pk,
+    )
+    start = find_occurrence(series, key)
+    if start is None:
+        raise Http404("No such occurrence")
+    return series, start
+
+def event_occurrence(request, pk, key):
+    """Detail page of one occurrence of a recurring event"""
+    series, start = get_occurrence_start(pk, key)
+    saved = Event.objects.filter(series=series, start_date=start).only('pk').first()
+    if saved is not None:
+        return redirect('events:detail', pk=saved.pk)
+
+    # Not saved yet, so nobody has registered for it
+    context = {
+        'event': build_occurrence(series, start),
+        'user_registered': False,
+        'registration_status': None,
+        'request_pending': False,
+        'occurrences': None,
     }
     return render(request, 'events/event_detail.html', context)
 
+@login_required
+def register_for_occurrence(request, pk, key):
+    """Save an occurrence of a recurring event on first registration, then register"""
+    series, start = get_occurrence_start(pk, key)
+    if not build_occurrence(series, start).is_accepting_registrations:
+        messages.error(request, 'Registration is closed for this event.')
+        return redirect('events:occurrence', pk=pk, key=key)
+    return register_for_event(request, materialize_occurrence(series, start).pk)
+
 @login_required
 def register_for_event(request, pk):
     """Register user for an event"""
     event = get_object_or_404(Event, pk=pk, status='published')
     
-    if not event.is_registration_open:
+    if not event.is_accepting_registrations:
         messages.error(request, 'Registration is closed for this event.')
         return redirect('events:detail', pk=pk)
     
-    try:
-        registration = Registration.objects.create(
-            event=event,
-            user=request.user,
-            status='confirmed'
-        )
-        messages.success(request, f'Successfully registered for "{event.title}"!')
-    except IntegrityError:
+    if event.use_registration_queue:
+        # High-demand event: only enqueue here, the queue worker assigns seats
+        registration_request, created = RegistrationRequest.objects.enqueue(event, request.user)
+        if created or registration_request.status == 'pending':
+            messages.info(request, 'Your registration request has been received and is being processed.')
+        else:
+            messages.warning(request, 'You are already registered for this event.')
+        return redirect('events:detail', pk=pk)
+
+    # Capacity is enforced atomically by the manager; full events waitlist
+    registration, created = Registration.objects.register(event, request.user)
+    if not created:
         messages.warning(request, 'You are already registered for this event.')
+    elif registration.status == 'waitlist':
+        messages.info(request, f'"{event.title}" is full. You have been added to the waitlist.')
+    else:
+        messages.success(request, f'Successfully registered for "{event.title}"!')
     
     return redirect('events:detail', pk=pk)
 
+@login_required
+def registration_status(request, pk):
+    """Poll target for queued registrations: status of the user's latest request"""
+    registration_request = RegistrationRequest.objects.filter(
+        event_id=pk, user=request.user
+    ).order_by('-id').values('status', 'processed_at').first()
+    if registration_request is None:
+        raise Http404("No registration request")
+    return JsonResponse(registration_request)
+
 @login_required
 def cancel_registration(request, pk):
     """Cancel user's registration for an event"""
@@ -67,7 +198,8 @@ def cancel_registration(request, pk):
     
     try:
         registration = Registration.objects.get(event=event, user=request.user)
-        registration.delete()
+        # Frees the seat and promotes the next waitlisted user into it
+        Registration.objects.cancel(registration)
         messages.success(request, f'Registration cancelled for "{event.title}".')
     except Registration.DoesNotExist:
         messages.error(request, 'No registration found for this event.')
@@ -81,9 +213,49 @@ def my_registrations(request):
     
     context = {
         'registrations': registrations,
+        'calendar_url': request.build_absolute_uri(
+            reverse('events:my_registrations_ical', args=[make_feed_token(request.user)])
+        ),
     }
     return render(request, 'events/my_registrations.html', context)
 
+def events_ical(request):
+    """iCalendar feed of published events"""
+    tenant = get_tenant(request)
+    return feed_response(request, 'events', lambda: events_calendar(tenant))
+
+def my_registrations_ical(request, token):
+    """iCalendar feed of one user's registrations, authenticated by a signed token"""
+    user_id = user_id_from_token(token)
+    if user_id is None:
+        raise Http404("Unknown calendar")
+    user = get_object_or_404(get_user_model(), pk=user_id, is_active=True)
+    tenant = get_tenant(request)
+    return feed_response(
+        request, f'user:{user.pk}',
+        lambda: registrations_calendar(tenant, user),
+        private=True,
+    )
+
+@staff_member_required
+def export_registrations(request, pk=None):
+    """
+    Stream registrations as CSV (default) or NDJSON (?format=ndjson), for a
+    single event or, without pk, for the whole tenant.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        raise Http404("Unknown export format")
+
+    registrations = Registration.objects.all()
+    filename = 'registrations'
+    if pk is not None:
+        event = get_object_or_404(Event, pk=pk)
+        registrations = registrations.filter(event=event)
+        filename = f'event-{event.pk}-registrations'
+
+    return export_response(registrations, filename, export_format)
+
 def signup(request):
     """User registration view"""
     if request.method == 'POST':
@@ -0,0 +1,74 @@
+# eventsaas/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+
+class LRUCache:
+    """
+    Small process-local cache used in front of the Django cache for data that
+    is read on every request. Entries are evicted least-recently-used once
+    `maxsize` is reached and expire `ttl` seconds after they were stored.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing/expired."""
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return default
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store value under key, evicting the oldest entry if full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Per-tenant content version. Cache keys that embed it go stale as soon as the
+# version is bumped (on Event/Registration/Company writes), without having to
+# find and delete them. Versions are timestamps, so a version evicted from
+# the cache can never come back as an older value.
+
+def _tenant_version_key(schema_name):
+    return f'tenant_version:{schema_name}'
+
+
+def get_tenant_version(schema_name):
+    return cache.get_or_set(_tenant_version_key(schema_name), time.time_ns, None)
+
+
+async def aget_tenant_version(schema_name):
+    return await cache.aget_or_set(_tenant_version_key(schema_name), time.time_ns, None)
+
+
+def bump_tenant_version(schema_name):
+    cache.set(_tenant_version_key(schema_name), time.time_ns(), None)
@@ -1,14 +1,36 @@
-from django.utils.deprecation import MiddlewareMixin
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django_tenants.utils import get_tenant
 
-class TenantURLConfMiddleware(MiddlewareMixin):
+
+class TenantURLConfMiddleware:
+    """
+    Pick the URLconf for the resolved tenant. Works natively under both WSGI
+    and ASGI, so async requests don't pay a thread hop for it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
     def process_request(self, request):
         tenant = get_tenant(request)
-        
+
         # Force URLconf based on tenant schema
         if tenant.schema_name == 'public':
             request.urlconf = 'eventsaas.urls'
         else:
             request.urlconf = 'eventsaas.tenant_urls'
-        
-        return None
\ No newline at end of file
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        return await self.get_response(request)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -65,7 +66,7 @@ CORS_ALLOW_ALL_ORIGINS = True  # Development only
 CORS_ALLOW_CREDENTIALS = True
 
 MIDDLEWARE = [
-    'django_tenants.middleware.main.TenantMainMiddleware', # Must be first
+    'companies.middleware.CachedTenantMainMiddleware', # Must be first
     'eventsaas.middleware.TenantURLConfMiddleware', 
     'companies.middleware.SubscriptionMiddleware', 
     'corsheaders.middleware.CorsMiddleware',
@@ -99,6 +100,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'eventsaas.wsgi.application'
 
+# Serve /api/ with the async views (api/views.py). Enable when running under
+# ASGI, e.g. `uvicorn eventsaas.asgi:application`.
+API_ASYNC_VIEWS = False
+
+# Keyset pagination for the event list and /api/events/ (?page_size= is
+# clamped to EVENTS_MAX_PAGE_SIZE)
+EVENTS_PAGE_SIZE = 20
+EVENTS_MAX_PAGE_SIZE = 100
+# Open-ended listings expand recurring events this many days around today
+EVENTS_RECURRENCE_HORIZON_DAYS = 90
+
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
@@ -117,6 +129,12 @@ DATABASES = {
 TENANT_MODEL = 'companies.Company'
 TENANT_DOMAIN_MODEL = 'companies.Domain'
 DATABASE_ROUTERS = ('django_tenants.routers.TenantSyncRouter',)
+# New tenant schemas are cloned from this template schema instead of being
+# migrated from scratch; the clone's migrations are then only faked.
+# Company.create_schema() migrates the template before every clone
+# (companies/provisioning.py), and migrate_tenants keeps it current.
+TENANT_BASE_SCHEMA = 'tenant_template'
+TENANT_CREATION_FAKES_MIGRATIONS = True
 
 
 # Password validation
@@ -181,3 +199,54 @@ TENANT_URLCONF = 'eventsaas.tenant_urls'
 
 # Force URLconf behavior
 PUBLIC_SCHEMA_URLCONF = 'eventsaas.urls'
+
+
+# Caching
+# Tenant resolution (companies/tenant_cache.py) and subscription state
+# (companies/subscriptions.py) use a short process-local TTL in front of the
+# shared Django cache.
+# The default cache must be shared by every process: invalidations and
+# version bumps made by management commands (setup_tenant, the queue and
+# notification workers, imports, collect_tenant_stats) have to reach the web
+# workers. Set CACHE_URL to a Redis server (redis://host:6379/0) in
+# production; without it each process gets its own LocMem cache, which is
+# only good enough for development and tests.
+CACHE_URL = os.environ.get('CACHE_URL', '')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+SUBSCRIPTION_CACHE_TTL = 300
+SUBSCRIPTION_CACHE_LOCAL_TTL = 5
+SUBSCRIPTION_CACHE_SIZE = 1024
+TENANT_DOMAIN_CACHE_TTL = 300
+TENANT_DOMAIN_CACHE_LOCAL_TTL = 30
+TENANT_DOMAIN_CACHE_SIZE = 1024
+# API responses are cached per tenant and content version (api/cache.py)
+API_CACHE_TTL = 300
+# iCalendar feeds (events/ical.py), versioned like the API cache
+ICAL_CACHE_TTL = 3600
+# {% cache %} fragments of the event pages are keyed by schema and content
+# version; the TTL only bounds how long the upcoming/past split can lag
+TEMPLATE_FRAGMENT_CACHE_TTL = 300
+# Public homepage stats (companies/stats.py), invalidated on Company changes
+PLATFORM_STATS_CACHE_TTL = 3600
+
+
+# Email
+# Registration notices and reminders are queued in the Notification outbox
+# and sent by `manage.py dispatch_notifications`. Use the locmem or
+# filebased backend to inspect them in tests/development.
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'EventSaaS <no-reply@eventsaas.local>'
+EVENT_REMINDER_HOURS = 24
+NOTIFICATION_URL_SCHEME = 'http'